@@ -11,6 +11,7 @@ from typing import Optional
 from agent import ComputerAgent
 from computer import Computer
 from agent.callbacks.ocr_processor import OCRProcessorCallback
+from agent_prompts import load_prompt
 
 
 class GuiOperatorComputerProxy:
@@ -32,27 +33,31 @@ class GuiOperatorComputerProxy:
         class GuiInterfaceProxy:
             """A proxy that exposes only the GUI-related methods of the real interface."""
 
+            _ALLOWED = frozenset({
+                # GUI Mouse Methods
+                "left_click", "right_click", "double_click", "move_cursor",
+                "mouse_down", "mouse_up", "drag",
+                # GUI Keyboard Methods
+                "type_text", "press_key", "hotkey", "key_down", "key_up",
+                # GUI Screen Methods
+                "screenshot", "get_screen_size", "get_cursor_position",
+                "scroll_down", "scroll_up",
+                # GUI Coordinate Methods
+                "to_screen_coordinates", "to_screenshot_coordinates",
+                # GUI Wait Methods
+                "wait_for_ready",
+            })
+
             def __init__(self, interface):
                 self._real_interface = interface
 
-            # GUI Mouse Methods
-            async def left_click(self, x: int, y: int, delay: Optional[float] = None): return await self._real_interface.left_click(x, y, delay)
-            async def right_click(self, x: int, y: int, delay: Optional[float] = None): return await self._real_interface.right_click(x, y, delay)
-            async def double_click(self, x: int, y: int, delay: Optional[float] = None): return await self._real_interface.double_click(x, y, delay)
-            async def move_cursor(self, x: int, y: int, delay: Optional[float] = None): return await self._real_interface.move_cursor(x, y, delay)
-            async def mouse_down(self, x: int, y: int, button: str = "left"): return await self._real_interface.mouse_down(x, y, button)
-            async def mouse_up(self, x: int, y: int, button: str = "left"): return await self._real_interface.mouse_up(x, y, button)
-            async def drag(self, path, button="left", duration=0.5): return await self._real_interface.drag(path, button, duration)
-
-            # GUI Keyboard Methods
-            async def type_text(self, text: str, delay: Optional[float] = None): return await self._real_interface.type_text(text, delay)
-            async def press_key(self, key: str, delay: Optional[float] = None): return await self._real_interface.press_key(key, delay)
-            async def hotkey(self, *keys: str, delay: Optional[float] = None): return await self._real_interface.hotkey(*keys, delay=delay)
-
-            # GUI Screen Methods
-            async def screenshot(self): return await self._real_interface.screenshot()
-            async def get_screen_size(self): return await self._real_interface.get_screen_size()
-            async def get_cursor_position(self): return await self._real_interface.get_cursor_position()
+            def __getattr__(self, name):
+                # Hand back the real bound coroutine function so calls aren't
+                # wrapped in an extra coroutine frame
+                if name in GuiInterfaceProxy._ALLOWED:
+                    return getattr(self._real_interface, name)
+                raise AttributeError(f"'{type(self).__name__}' does not expose '{name}'")
+
             async def scroll(self, x: int = 0, y: int = 0, scroll_x: int = 0, scroll_y: int = 0):
                 """Handle scrolling with scroll amounts."""
                 # Use scroll_down/scroll_up for vertical scrolling by amounts
@@ -73,19 +78,6 @@ class GuiOperatorComputerProxy:
                 else:
                     # No vertical scroll, just use coordinates
                     return await self._real_interface.scroll(x, y)
-            async def scroll_down(self, clicks: int = 1, delay: Optional[float] = None): return await self._real_interface.scroll_down(clicks, delay)
-            async def scroll_up(self, clicks: int = 1, delay: Optional[float] = None): return await self._real_interface.scroll_up(clicks, delay)
-
-            # GUI Keyboard Methods (additional)
-            async def key_down(self, key: str, delay: Optional[float] = None): return await self._real_interface.key_down(key, delay)
-            async def key_up(self, key: str, delay: Optional[float] = None): return await self._real_interface.key_up(key, delay)
-
-            # GUI Coordinate Methods
-            async def to_screen_coordinates(self, x: float, y: float): return await self._real_interface.to_screen_coordinates(x, y)
-            async def to_screenshot_coordinates(self, x: float, y: float): return await self._real_interface.to_screenshot_coordinates(x, y)
-
-            # GUI Wait Methods
-            async def wait_for_ready(self, timeout: int = 60): return await self._real_interface.wait_for_ready(timeout)
 
         return GuiInterfaceProxy(real_interface)
 
@@ -102,19 +94,16 @@ class GuiOperatorComputerProxy:
         if not self.ocr_callback:
             return f"Error: OCR callback not available"
 
-        bbox = self.ocr_callback.get_ocr_bbox(ocr_id)
-        if bbox is None:
+        target = self.ocr_callback.get_ocr_target(ocr_id)
+        if target is None:
             return f"Error: OCR ID {ocr_id} not found"
 
-        x1, y1, x2, y2 = bbox
-        # Calculate center coordinates
-        center_x = (x1 + x2) // 2
-        center_y = (y1 + y2) // 2
+        content, center_x, center_y = target
 
         try:
             # Perform the click at center coordinates
             await self.interface.left_click(center_x, center_y)
-            content = self.ocr_callback.get_ocr_content(ocr_id) or f"ID {ocr_id}"
+            content = content or f"ID {ocr_id}"
             return f"Successfully clicked on OCR text element: '{content}' at ({center_x}, {center_y})"
         except Exception as e:
             return f"Error clicking OCR text element {ocr_id}: {e}"
@@ -132,19 +121,16 @@ class GuiOperatorComputerProxy:
         if not self.ocr_callback:
             return f"Error: OCR callback not available"
 
-        bbox = self.ocr_callback.get_ocr_bbox(ocr_id)
-        if bbox is None:
+        target = self.ocr_callback.get_ocr_target(ocr_id)
+        if target is None:
             return f"Error: OCR ID {ocr_id} not found"
 
-        x1, y1, x2, y2 = bbox
-        # Calculate center coordinates
-        center_x = (x1 + x2) // 2
-        center_y = (y1 + y2) // 2
+        content, center_x, center_y = target
 
         try:
             # Perform the right-click at center coordinates
             await self.interface.right_click(center_x, center_y)
-            content = self.ocr_callback.get_ocr_content(ocr_id) or f"ID {ocr_id}"
+            content = content or f"ID {ocr_id}"
             return f"Successfully right-clicked on OCR text element: '{content}' at ({center_x}, {center_y})"
         except Exception as e:
             return f"Error right-clicking OCR text element {ocr_id}: {e}"
@@ -162,19 +148,16 @@ class GuiOperatorComputerProxy:
         if not self.ocr_callback:
             return f"Error: OCR callback not available"
 
-        bbox = self.ocr_callback.get_ocr_bbox(ocr_id)
-        if bbox is None:
+        target = self.ocr_callback.get_ocr_target(ocr_id)
+        if target is None:
             return f"Error: OCR ID {ocr_id} not found"
 
-        x1, y1, x2, y2 = bbox
-        # Calculate center coordinates
-        center_x = (x1 + x2) // 2
-        center_y = (y1 + y2) // 2
+        content, center_x, center_y = target
 
         try:
             # Perform the double-click at center coordinates
             await self.interface.double_click(center_x, center_y)
-            content = self.ocr_callback.get_ocr_content(ocr_id) or f"ID {ocr_id}"
+            content = content or f"ID {ocr_id}"
             return f"Successfully double-clicked on OCR text element: '{content}' at ({center_x}, {center_y})"
         except Exception as e:
             return f"Error double-clicking OCR text element {ocr_id}: {e}"
@@ -187,10 +170,12 @@ class GuiOperatorComputerProxy:
 
 def create_gui_operator(gui_operator_model: str, gui_operator_computer: Computer, ocr_broadcast_callback=None, grounding_broadcast_callback=None, function_call_broadcast_callback=None, screenshot_broadcast_callback=None) -> ComputerAgent:
     """Creates and configures the GUI Operator agent with OCR support."""
-    instructions = open("agent_prompts/GUIOperator.txt", "r").read()
+    instructions = load_prompt("GUIOperator")
 
     # Create OCR callback for preprocessing screenshots
     ocr_callback = OCRProcessorCallback(device="cuda", broadcast_callback=ocr_broadcast_callback)
+    # Load the OCR model in the background so the first action doesn't pay for it
+    ocr_callback.prewarm()
 
     # Create the GUI computer proxy with OCR callback
     gui_proxy = GuiOperatorComputerProxy(gui_operator_computer, ocr_callback)
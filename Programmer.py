@@ -6,17 +6,31 @@ This module contains the Programmer agent implementation, including:
 - Programmer agent creation logic
 """
 
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set
 from agent import ComputerAgent
 from computer import Computer
+from agent_prompts import load_prompt
 
 
 class ProgrammerTools:
     """A toolkit for the Programmer agent that provides code and system-level tools."""
 
+    # Upper bound on how long run_command_in_background waits for the launch to be acknowledged
+    BACKGROUND_LAUNCH_TIMEOUT = 2.0
+
     def __init__(self, computer: Computer):
         self._computer = computer
+        # Launches still waiting for their acknowledgement; kept referenced so
+        # they finish in the background after the tool has returned
+        self._background_launches: Set[asyncio.Task] = set()
+
+    def _launch_done(self, task: asyncio.Task):
+        """Forget a finished background launch and report a late failure."""
+        self._background_launches.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"⚠️ [PROGRAMMER] Background launch failed: {task.exception()}")
 
     async def run_command(self, command: str) -> str:
         """
@@ -47,24 +61,30 @@ class ProgrammerTools:
             command (str): The shell command to execute.
 
         Returns:
-            str: Confirmation that the command was started in background.
+            str: Confirmation that the command was started in background, or a
+                note that the launch has not been confirmed yet.
         """
-        # Run command in background with complete detachment
-        background_command = f"setsid {command} >/dev/null 2>&1 &"
-
-        # Create a task to run the command without blocking
-        async def run_background_command():
-            try:
-                await self._computer.interface.run_command(background_command)
-            except Exception:
-                # Ignore errors since we're not waiting anyway
-                pass
-
-        # Start the task but don't wait for it
-        import asyncio
-        asyncio.create_task(run_background_command())
-
-        # Return immediately - no output capture, no waiting
+        # Run command in background with complete detachment; the shell returns
+        # as soon as the process is forked, so this await is short
+        background_command = f"setsid {command} </dev/null >/dev/null 2>&1 &"
+
+        # The launch runs as its own task and is shielded from the timeout:
+        # cancelling it mid-request would leave its reply unread on the computer
+        # connection, where the next command would pick it up as its own
+        launch = asyncio.create_task(self._computer.interface.run_command(background_command))
+        self._background_launches.add(launch)
+        launch.add_done_callback(self._launch_done)
+
+        try:
+            await asyncio.wait_for(asyncio.shield(launch), timeout=self.BACKGROUND_LAUNCH_TIMEOUT)
+        except asyncio.TimeoutError:
+            return (
+                f"Launch of '{command}' not confirmed within {self.BACKGROUND_LAUNCH_TIMEOUT:g}s; "
+                "it may still start. Check whether it is running before launching it again."
+            )
+        except Exception as e:
+            return f"Error starting command '{command}' in background: {e}"
+
         return f"Command '{command}' started in background."
 
     async def list_dir(self, path: str) -> List[str]:
@@ -157,7 +177,7 @@ class ProgrammerTools:
 
 def create_programmer(programmer_model: str, programmer_tools: ProgrammerTools, screenshot_broadcast_callback=None, function_call_broadcast_callback=None) -> ComputerAgent:
     """Creates and configures the Programmer agent."""
-    instructions = open("agent_prompts/Programmer.txt", "r").read()
+    instructions = load_prompt("Programmer")
 
     # Gather all methods from the toolkit instance
     programmer_tool_methods = [
@@ -33,6 +33,8 @@ export const CurrentTaskDisplay = () => {
         };
 
         ws.onmessage = (event) => {
+          // Binary frames carry screenshot pixels; only the screenshot panels use them
+          if (typeof event.data !== 'string') return;
           console.log('📨 Received WebSocket message:', event.data);
           try {
             const message = JSON.parse(event.data);
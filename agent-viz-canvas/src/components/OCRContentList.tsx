@@ -30,6 +30,8 @@ export const OCRContentList = () => {
         };
 
         ws.onmessage = (event) => {
+          // Binary frames carry screenshot pixels; only the screenshot panels use them
+          if (typeof event.data !== 'string') return;
           try {
             const message = JSON.parse(event.data);
             handleWebSocketMessage(message);
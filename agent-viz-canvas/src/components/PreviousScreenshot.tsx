@@ -7,17 +7,25 @@ export const PreviousScreenshot = () => {
   const [previousScreenshot, setPreviousScreenshot] = useState<string | null>(null);
   const [timestamp, setTimestamp] = useState<Date | null>(null);
   const websocketRef = useRef<WebSocket | null>(null);
+  // Header of the screenshot whose binary frame is expected next, and the object URL currently shown
+  const pendingScreenshotRef = useRef<any>(null);
+  const screenshotUrlRef = useRef<string | null>(null);
 
   useEffect(() => {
     const connectWebSocket = () => {
       try {
         const ws = new WebSocket('ws://localhost:8765');
+        ws.binaryType = 'blob';
 
         ws.onopen = () => {
           console.log('📡 PreviousScreenshot connected to CoAct-1 WebSocket server');
         };
 
         ws.onmessage = (event) => {
+          if (typeof event.data !== 'string') {
+            handleScreenshotFrame(event.data as Blob);
+            return;
+          }
           try {
             const message = JSON.parse(event.data);
             handleWebSocketMessage(message);
@@ -51,20 +59,36 @@ export const PreviousScreenshot = () => {
     };
   }, []);
 
+  const showScreenshot = (url: string | null) => {
+    if (screenshotUrlRef.current) {
+      URL.revokeObjectURL(screenshotUrlRef.current);
+    }
+    screenshotUrlRef.current = url;
+    setPreviousScreenshot(url);
+  };
+
+  const handleScreenshotFrame = (blob: Blob) => {
+    // The binary frame follows the JSON screenshot_update header it belongs to
+    const header = pendingScreenshotRef.current;
+    pendingScreenshotRef.current = null;
+    if (!header) return;
+
+    showScreenshot(URL.createObjectURL(new Blob([blob], { type: header.mime_type })));
+    setTimestamp(new Date(header.timestamp * 1000));
+  };
+
   const handleWebSocketMessage = (message: any) => {
     const { type, data } = message;
 
     switch (type) {
       case 'screenshot_update':
-        if (data.screenshot_type === 'previous') {
-          setPreviousScreenshot(data.screenshot_data);
-          setTimestamp(new Date(data.timestamp * 1000));
-        }
+        pendingScreenshotRef.current = data.screenshot_type === 'previous' ? data : null;
         break;
 
       case 'ui_reset':
         // Reset previous screenshot state
-        setPreviousScreenshot(null);
+        pendingScreenshotRef.current = null;
+        showScreenshot(null);
         setTimestamp(null);
         break;
 
@@ -104,7 +128,7 @@ export const PreviousScreenshot = () => {
           {previousScreenshot ? (
             <>
               <img
-                src={`data:image/png;base64,${previousScreenshot}`}
+                src={previousScreenshot}
                 alt="Previous Screenshot"
                 className="absolute inset-0 w-full h-full object-contain"
               />
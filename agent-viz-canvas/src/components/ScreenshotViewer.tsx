@@ -15,17 +15,25 @@ export const ScreenshotViewer = () => {
   const [currentScreenshot, setCurrentScreenshot] = useState<string | null>(null);
   const [agentAction, setAgentAction] = useState<AgentAction | null>(null);
   const websocketRef = useRef<WebSocket | null>(null);
+  // Header of the screenshot whose binary frame is expected next, and the object URL currently shown
+  const pendingScreenshotRef = useRef<any>(null);
+  const screenshotUrlRef = useRef<string | null>(null);
 
   useEffect(() => {
     const connectWebSocket = () => {
       try {
         const ws = new WebSocket('ws://localhost:8765');
+        ws.binaryType = 'blob';
 
         ws.onopen = () => {
           console.log('📡 ScreenshotViewer connected to CoAct-1 WebSocket server');
         };
 
         ws.onmessage = (event) => {
+          if (typeof event.data !== 'string') {
+            handleScreenshotFrame(event.data as Blob);
+            return;
+          }
           try {
             const message = JSON.parse(event.data);
             handleWebSocketMessage(message);
@@ -60,19 +68,37 @@ export const ScreenshotViewer = () => {
     };
   }, []);
 
+  const showScreenshot = (url: string | null) => {
+    if (screenshotUrlRef.current) {
+      URL.revokeObjectURL(screenshotUrlRef.current);
+    }
+    screenshotUrlRef.current = url;
+    setCurrentScreenshot(url);
+  };
+
+  const handleScreenshotFrame = (blob: Blob) => {
+    // The binary frame follows the JSON screenshot_update header it belongs to
+    const header = pendingScreenshotRef.current;
+    pendingScreenshotRef.current = null;
+    if (!header) return;
+
+    showScreenshot(URL.createObjectURL(new Blob([blob], { type: header.mime_type })));
+    if (header.screenshot_type === 'current') {
+      // Clear agent action when new screenshot arrives
+      setAgentAction(null);
+    }
+    // Keep agent action for real-time sub-agent screenshots
+  };
+
   const handleWebSocketMessage = (message: any) => {
     const { type, data } = message;
 
     switch (type) {
       case 'screenshot_update':
-        if (data.screenshot_type === 'current') {
-          setCurrentScreenshot(data.screenshot_data);
-          // Clear agent action when new screenshot arrives
-          setAgentAction(null);
-        } else if (data.screenshot_type === 'guioperator_realtime' || data.screenshot_type === 'programmer_realtime' || data.screenshot_type === 'screenshot_after_function') {
-          // Update current screenshot with real-time sub-agent screenshot
-          setCurrentScreenshot(data.screenshot_data);
-          // Keep agent action for real-time updates
+        if (data.screenshot_type === 'current' || data.screenshot_type === 'guioperator_realtime' || data.screenshot_type === 'programmer_realtime' || data.screenshot_type === 'screenshot_after_function') {
+          pendingScreenshotRef.current = data;
+        } else {
+          pendingScreenshotRef.current = null;
         }
         break;
 
@@ -105,7 +131,8 @@ export const ScreenshotViewer = () => {
 
       case 'ui_reset':
         // Reset all screenshot viewer state
-        setCurrentScreenshot(null);
+        pendingScreenshotRef.current = null;
+        showScreenshot(null);
         setAgentAction(null);
         break;
 
@@ -146,7 +173,7 @@ export const ScreenshotViewer = () => {
           {/* Display actual screenshot */}
           {currentScreenshot ? (
             <img
-              src={`data:image/png;base64,${currentScreenshot}`}
+              src={currentScreenshot}
               alt="Current Screenshot"
               className="absolute inset-0 w-full h-full object-contain"
             />
@@ -3,6 +3,7 @@ ComputerAgent - Main agent class that selects and runs agent loops
 """
 
 import asyncio
+import copy
 from pathlib import Path
 from typing import Dict, List, Any, Optional, AsyncGenerator, Union, cast, Callable, Set, Tuple
 
@@ -40,6 +41,25 @@ from .computers import (
     make_computer_handler
 )
 
+# Function tool schemas keyed by (code object, name, docstring). Schemas only
+# depend on a function's signature and docstring, so every agent built from the
+# same tool definitions (e.g. one per session) can reuse them instead of re-parsing.
+_FUNCTION_SCHEMA_CACHE: Dict[Any, Dict[str, Any]] = {}
+
+def get_function_schema(tool: Callable) -> Dict[str, Any]:
+    """Return litellm's function schema for a tool, parsing each definition only once."""
+    func = getattr(tool, "__func__", tool)
+    code = getattr(func, "__code__", None)
+    # Decorated tools share their wrapper's code object, while their schema
+    # comes from the wrapped function; don't cache those
+    if code is None or hasattr(func, "__wrapped__"):
+        return litellm.utils.function_to_dict(tool)
+    key = (code, func.__name__, func.__doc__)
+    schema = _FUNCTION_SCHEMA_CACHE.get(key)
+    if schema is None:
+        schema = _FUNCTION_SCHEMA_CACHE[key] = litellm.utils.function_to_dict(tool)
+    return copy.deepcopy(schema)
+
 def assert_callable_with(f, *args, **kwargs):
    """Check if function can be called with given arguments."""
    try:
@@ -50,13 +70,19 @@ def assert_callable_with(f, *args, **kwargs):
        raise IllegalArgumentError(f"Expected {sig}, got args={args} kwargs={kwargs}") from e
 
 def get_json(obj: Any, max_depth: int = 10) -> Any:
+    def json_key(k: Any) -> str:
+        # Mirror json.dumps, which coerces non-string keys (e.g. 1 -> "1", True -> "true")
+        return k if isinstance(k, str) else json.dumps(k)
+
     def custom_serializer(o: Any, depth: int = 0, seen: Optional[Set[int]] = None) -> Any:
         if seen is None:
             seen = set()
         
-        # Use model_dump() if available
+        # Use model_dump() if available, then normalise its output like any other
+        # dict. The dump is already plain data, so it is walked with its own
+        # depth budget and comes back complete however deep the model sits
         if hasattr(o, 'model_dump'):
-            return o.model_dump()
+            return custom_serializer(o.model_dump(), 0)
         
         # Check depth limit
         if depth > max_depth:
@@ -90,7 +116,7 @@ def get_json(obj: Any, max_depth: int = 10) -> Any:
             seen.add(obj_id)
             try:
                 return {
-                    k: custom_serializer(v, depth + 1, seen.copy())
+                    json_key(k): custom_serializer(v, depth + 1, seen.copy())
                     for k, v in o.items()
                     if v is not None
                 }
@@ -116,22 +142,11 @@ def get_json(obj: Any, max_depth: int = 10) -> Any:
         else:
             return str(o)
     
-    def remove_nones(obj: Any) -> Any:
-        if isinstance(obj, dict):
-            return {k: remove_nones(v) for k, v in obj.items() if v is not None}
-        elif isinstance(obj, list):
-            return [remove_nones(item) for item in obj if item is not None]
-        return obj
-    
-    # Serialize with circular reference and depth protection
-    serialized = custom_serializer(obj)
-    
-    # Convert to JSON string and back to ensure JSON compatibility
-    json_str = json.dumps(serialized)
-    parsed = json.loads(json_str)
-    
-    # Final cleanup of any remaining None values
-    return remove_nones(parsed)
+    # Serialize with circular reference and depth protection. The walk already
+    # builds fresh JSON-compatible containers without None values, so there is no
+    # need to round-trip through json.dumps/json.loads, which copied every base64
+    # screenshot in the history on each callback.
+    return custom_serializer(obj)
 
 def sanitize_message(msg: Any) -> Any:
     """Return a copy of the message with image_url omitted for computer_call_output messages."""
@@ -289,6 +304,7 @@ class ComputerAgent:
         
         self.tool_schemas = []
         self.computer_handler = None
+        self._tools_by_name: Optional[Dict[str, Callable]] = None
         
     async def _initialize_computers(self):
         """Initialize computer objects"""
@@ -325,7 +341,7 @@ class ComputerAgent:
             elif callable(tool):
                 # Use litellm.utils.function_to_dict to extract schema from docstring
                 try:
-                    function_schema = litellm.utils.function_to_dict(tool)
+                    function_schema = get_function_schema(tool)
                     print(f"📋 [TOOL REGISTRATION] Registered tool: {function_schema.get('name', 'unknown')} from {tool}")
                     schemas.append({
                         "type": "function",
@@ -341,19 +357,20 @@ class ComputerAgent:
     
     def _get_tool(self, name: str) -> Optional[Callable]:
         """Get a tool by name"""
-        print(f"🔍 [TOOL LOOKUP] Looking for tool: '{name}'")
-        for tool in self.tools:
-            tool_name = getattr(tool, '__name__', None)
-            func_name = getattr(getattr(tool, 'func', None), '__name__', None)
-            print(f"   Checking tool: __name__='{tool_name}', func.__name__='{func_name}'")
-            if tool_name == name:
-                print(f"   ✅ Found tool by __name__: {tool}")
-                return tool
-            elif func_name == name:
-                print(f"   ✅ Found tool by func.__name__: {tool}")
-                return tool
-        print(f"   ❌ Tool '{name}' not found")
-        return None
+        if self._tools_by_name is None:
+            # Build the dispatch table once; the first tool to claim a name
+            # (by __name__ or func.__name__) wins, as in a linear scan
+            tools_by_name: Dict[str, Callable] = {}
+            for tool in self.tools:
+                for tool_name in (getattr(tool, '__name__', None), getattr(getattr(tool, 'func', None), '__name__', None)):
+                    if tool_name is not None:
+                        tools_by_name.setdefault(tool_name, tool)
+            self._tools_by_name = tools_by_name
+
+        tool = self._tools_by_name.get(name)
+        if tool is None:
+            print(f"🔍 [TOOL LOOKUP] ❌ Tool '{name}' not found")
+        return tool
     
     # ============================================================================
     # AGENT RUN LOOP LIFECYCLE HOOKS
@@ -5,64 +5,212 @@ Performs OCR on screenshots before LLM processing and provides text element dete
 for efficient GUI interaction.
 """
 
-import base64
+import asyncio
+import binascii
+import hashlib
 import io
-from typing import List, Dict, Any, Optional, Tuple
+import multiprocessing
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Any, Optional, Tuple, Union
+
+import numpy as np
 from PIL import Image
 
 from .base import AsyncCallbackHandler
 
+_PNG_DATA_URL_PREFIX = "data:image/png;base64,"
+_OCR_HEADER = "OCR-DETECTED TEXT ELEMENTS:"
+
+# (contents, bboxes) lists indexed by OCR ID; bbox is (x1, y1, x2, y2)
+OCRResults = Tuple[List[str], List[Tuple[int, int, int, int]]]
+
 
 def get_rapid_ocr_engine(device: str = "cpu"):
     """
     Initialize RapidOCR engine.
 
     Args:
-        device: Device to use ("cpu" or "cuda")
+        device: Device to use ("cpu", "cuda" or "dml" for DirectML on Windows)
 
     Returns:
         RapidOCR engine instance
     """
     params = {
+        "EngineConfig.onnxruntime.intra_op_num_threads": max(1, (os.cpu_count() or 2) // 2),
         "EngineConfig.onnxruntime.use_cuda": device == "cuda",
+        "EngineConfig.onnxruntime.use_dml": device == "dml",
     }
     from rapidocr import RapidOCR
     engine = RapidOCR(params=params)
     return engine
 
 
-def check_ocr_result(result, text_threshold=0.9):
+def warmup_rapid_ocr_engine(engine, size: int = 256) -> None:
+    """
+    Run a throwaway inference so session setup and kernel selection happen
+    before the first real screenshot.
+
+    Args:
+        engine: RapidOCR engine instance
+        size: Side length of the blank warmup image
+    """
+    engine(Image.new("RGB", (size, size), "white"))
+
+
+def _texts_match(a: str, b: str) -> bool:
+    """Whether two OCR strings are close enough to treat as the same element."""
+    a = a.strip().lower()
+    b = b.strip().lower()
+    return a == b or (bool(a) and bool(b) and (a in b or b in a))
+
+
+def suppress_duplicate_boxes(text: List[str], boxes: np.ndarray, scores: np.ndarray, iou_threshold: float = 0.5) -> np.ndarray:
+    """
+    Greedy non-max suppression over OCR boxes.
+
+    A box is dropped when it overlaps a higher-scoring kept box by more than
+    ``iou_threshold`` and carries the same (or contained) text, so genuinely
+    different overlapping labels survive.
+
+    Args:
+        text: Recognised strings, one per box
+        boxes: (N, 4) array of (x1, y1, x2, y2)
+        scores: (N,) recognition scores
+        iou_threshold: IoU above which two matching boxes are considered duplicates
+
+    Returns:
+        Sorted indices of the boxes to keep
+    """
+    n = len(boxes)
+    if n < 2:
+        return np.arange(n)
+
+    x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+    areas = np.maximum(0, x2 - x1) * np.maximum(0, y2 - y1)
+    inter_w = np.maximum(0, np.minimum(x2[:, None], x2) - np.maximum(x1[:, None], x1))
+    inter_h = np.maximum(0, np.minimum(y2[:, None], y2) - np.maximum(y1[:, None], y1))
+    inter = inter_w * inter_h
+    union = areas[:, None] + areas - inter
+    iou = np.divide(inter, union, out=np.zeros_like(inter, dtype=np.float64), where=union > 0)
+
+    suppressed = np.zeros(n, dtype=bool)
+    for i in np.argsort(-scores, kind="stable"):
+        if suppressed[i]:
+            continue
+        for j in np.nonzero((iou[i] > iou_threshold) & ~suppressed)[0]:
+            if j != i and _texts_match(text[i], text[j]):
+                suppressed[j] = True
+
+    return np.nonzero(~suppressed)[0]
+
+
+def check_ocr_result(result, text_threshold=0.9, scale=1.0, iou_threshold=0.5):
     """
     Process OCR results from RapidOCR.
 
     Args:
         result: OCR result from RapidOCR
         text_threshold: Minimum confidence score for text detection
+        scale: Factor the image was resized by before OCR; boxes are mapped
+            back to original image coordinates by dividing by it
+        iou_threshold: IoU above which duplicate boxes with matching text are
+            merged (None to disable suppression)
 
     Returns:
         Tuple of (text_list, bbox_list) where bbox is (x1, y1, x2, y2)
     """
-    if result is None:
+    txts = getattr(result, 'txts', None)
+    if txts is None or len(txts) == 0:
         return [], []
 
-    text = []
-    bb = []
+    scores = np.fromiter(result.scores, dtype=np.float32, count=len(txts))
+    keep = np.flatnonzero(scores > text_threshold)
+    if keep.size == 0:
+        return [], []
+
+    # (N, 4, 2) quadrilaterals -> per-box min/max in a single reduction
+    boxes = np.asarray(result.boxes, dtype=np.float32)[keep]
+    if scale != 1.0:
+        boxes /= scale
+    rects = np.concatenate([boxes.min(axis=1), boxes.max(axis=1)], axis=1).astype(np.int32)
+    text = [txts[i] for i in keep.tolist()]
+
+    if iou_threshold is not None:
+        keep_idx = suppress_duplicate_boxes(text, rects, scores[keep], iou_threshold)
+        rects = rects[keep_idx]
+        text = [text[i] for i in keep_idx.tolist()]
+
+    return text, [tuple(row) for row in rects.tolist()]
+
+
+def prepare_ocr_input(image_bytes: bytes, max_edge: Optional[int]) -> Tuple[Any, float]:
+    """
+    Downscale the screenshot if its longest side exceeds ``max_edge``.
+
+    Args:
+        image_bytes: Raw PNG bytes of the screenshot
+        max_edge: Maximum length of the longest side (None to disable)
+
+    Returns:
+        Tuple of (OCR engine input, scale factor). Screenshots that are small
+        enough are returned as the original bytes so RapidOCR decodes them itself.
+    """
+    if not max_edge:
+        return image_bytes, 1.0
+
+    # Image.open only parses the header here; pixels are decoded on resize
+    image = Image.open(io.BytesIO(image_bytes))
+    width, height = image.size
+    scale = min(1.0, max_edge / max(width, height))
+    if scale >= 1.0:
+        return image_bytes, 1.0
+
+    resized = image.convert("RGB").resize(
+        (max(1, int(width * scale)), max(1, int(height * scale))),
+        Image.BILINEAR,
+    )
+    return resized, scale
+
+
+# --- OCR worker process ---
+# The engine lives in a dedicated process so its Python-side pre/post-processing
+# doesn't compete with the agent's event loop for the GIL.
+
+_worker_engine = None
 
-    if hasattr(result, 'txts') and result.txts is not None:
-        for txt, score, box in zip(result.txts, result.scores, result.boxes):
-            if score > text_threshold:
-                text.append(txt)
 
-                x_coords = [p[0] for p in box]
-                y_coords = [p[1] for p in box]
-                x1 = int(min(x_coords))
-                y1 = int(min(y_coords))
-                x2 = int(max(x_coords))
-                y2 = int(max(y_coords))
+def _init_ocr_worker(device: str) -> None:
+    """Process pool initializer: build and warm up the worker's OCR engine."""
+    global _worker_engine
+    _worker_engine = get_rapid_ocr_engine(device=device)
+    try:
+        warmup_rapid_ocr_engine(_worker_engine)
+    except Exception as e:
+        print(f"⚠️ OCR engine warmup failed: {e}")
 
-                bb.append((x1, y1, x2, y2))
 
-    return text, bb
+def _ocr_worker_ready() -> bool:
+    """No-op task used to wait for the worker's initializer to finish."""
+    return _worker_engine is not None
+
+
+def _run_ocr_in_worker(image_bytes: bytes, max_edge: Optional[int]) -> Tuple[List[str], List[Tuple[int, int, int, int]]]:
+    """
+    Run RapidOCR on a screenshot inside the worker process.
+
+    Args:
+        image_bytes: Raw PNG bytes of the screenshot
+        max_edge: Downscale limit passed to prepare_ocr_input
+
+    Returns:
+        Tuple of (text_list, bbox_list) in original image coordinates
+    """
+    ocr_input, scale = prepare_ocr_input(image_bytes, max_edge)
+    result = _worker_engine(ocr_input)
+    return check_ocr_result(result, scale=scale)
 
 
 class OCRProcessorCallback(AsyncCallbackHandler):
@@ -74,117 +222,391 @@ class OCRProcessorCallback(AsyncCallbackHandler):
     text element clicking.
     """
 
-    def __init__(self, device: str = "cpu", broadcast_callback=None):
+    def __init__(self, device: str = "cpu", broadcast_callback=None, cache_size: int = 32, max_edge: Optional[int] = 1280,
+                 prefetch_frames: int = 3):
         """
         Initialize OCR processor callback.
 
         Args:
             device: Device for OCR engine ("cpu" or "cuda")
             broadcast_callback: Optional callback function to broadcast OCR results
+            cache_size: Number of screenshots whose OCR results are kept in the LRU cache
+            max_edge: Screenshots whose longest side exceeds this are downscaled
+                before OCR (None to always run at full resolution)
+            prefetch_frames: Number of older, not yet OCR'd screenshots in the
+                history to OCR in the background after each turn (0 to disable)
         """
         self.device = device
-        self.ocr_engine = None
-        self.ocr_results = {}  # Map OCR ID -> (content, bbox)
+        self.max_edge = max_edge
+        self._ocr_pool: Optional[ProcessPoolExecutor] = None  # Single-worker process holding the engine
+        self._init_task: Optional[asyncio.Future] = None
+        # Latest OCR results, indexed by OCR ID
+        self.ocr_contents: List[str] = []
+        self.ocr_bboxes: List[Tuple[int, int, int, int]] = []
         self.broadcast_callback = broadcast_callback
 
-    async def _initialize_ocr_engine(self):
-        """Lazy initialization of OCR engine."""
-        if self.ocr_engine is None:
-            self.ocr_engine = get_rapid_ocr_engine(device=self.device)
+        # LRU cache: screenshot hash -> ((contents, bboxes), formatted OCR text)
+        self.cache_size = cache_size
+        self._ocr_cache: OrderedDict = OrderedDict()
+        self._ocr_text: Optional[str] = None  # Formatted OCR text for the latest screenshot
+
+        # Last decoded screenshot data URL (held by reference) and its bytes
+        self._last_image_url: Optional[str] = None
+        self._last_image_bytes: Optional[bytes] = None
+
+        # Background OCR of older frames; data URLs already handled, keyed by id()
+        # with the string held so the id can't be reused while it's in the map
+        self.prefetch_frames = prefetch_frames
+        self._prefetch_task: Optional[asyncio.Task] = None
+        self._seen_image_urls: OrderedDict = OrderedDict()
+
+        # OCR started from on_screenshot, keyed by screenshot hash, so it runs
+        # alongside the screenshot broadcast and on_llm_start can await it
+        self._pending_ocr: Dict[bytes, asyncio.Task] = {}
+
+    async def _load_ocr_engine(self) -> ProcessPoolExecutor:
+        """Start the OCR worker process and wait until its engine is built and warmed up."""
+        # spawn rather than fork: a forked child can't safely initialise CUDA
+        pool = ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_ocr_worker,
+            initargs=(self.device,),
+        )
+        try:
+            await asyncio.get_running_loop().run_in_executor(pool, _ocr_worker_ready)
+        except BaseException:
+            # Also on cancellation (shutdown() during the load), so the worker doesn't leak
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        self._ocr_pool = pool
+        return pool
+
+    async def _initialize_ocr_engine(self) -> ProcessPoolExecutor:
+        """
+        Lazy initialization of OCR engine, sharing any load already in flight.
 
-    def _extract_latest_screenshot(self, messages: List[Dict[str, Any]]) -> Optional[Image.Image]:
+        Returns:
+            The worker pool to submit OCR to. Callers should hold on to it rather
+            than re-read ``self._ocr_pool``, which shutdown() may clear meanwhile.
         """
-        Extract the latest screenshot from messages.
+        pool = self._ocr_pool
+        if pool is None:
+            if self._init_task is None:
+                self._init_task = asyncio.ensure_future(self._load_ocr_engine())
+            init_task = self._init_task
+            try:
+                pool = await init_task
+            except asyncio.CancelledError:
+                if asyncio.current_task().cancelling():
+                    raise
+                # The load itself was cancelled by shutdown(), not this caller
+                raise RuntimeError("OCR worker was shut down while starting") from None
+            except Exception:
+                # Allow a later call to retry the load
+                if self._init_task is init_task:
+                    self._init_task = None
+                raise
+        return pool
+
+    def prewarm(self) -> None:
+        """
+        Start loading the OCR engine in the background.
+
+        Safe to call from synchronous construction code: if no event loop is
+        running, the engine is loaded lazily on the first screenshot instead.
+        """
+        if self._ocr_pool is not None or self._init_task is not None:
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._init_task = asyncio.ensure_future(self._load_ocr_engine())
+
+    def shutdown(self) -> None:
+        """Stop the OCR worker process, including one that is still starting up."""
+        if self._init_task is not None and not self._init_task.done():
+            self._init_task.cancel()
+        self._init_task = None
+        if self._ocr_pool is not None:
+            self._ocr_pool.shutdown(wait=False, cancel_futures=True)
+            self._ocr_pool = None
+
+    def _decode_image_url(self, image_url: str) -> Optional[bytes]:
+        """
+        Decode a PNG data URL, reusing the previous result for the same string.
 
         Args:
-            messages: List of message dictionaries
+            image_url: ``data:image/png;base64,...`` URL
 
         Returns:
-            PIL Image of the latest screenshot, or None if not found
+            Raw PNG bytes, or None if the URL isn't a decodable PNG data URL
+        """
+        # Histories are appended to, not rebuilt, so the latest screenshot is
+        # usually the very same string object as on the previous turn
+        if image_url is self._last_image_url:
+            return self._last_image_bytes
+
+        if not image_url.startswith(_PNG_DATA_URL_PREFIX):
+            return None
+        try:
+            image_bytes = binascii.a2b_base64(image_url[len(_PNG_DATA_URL_PREFIX):])
+        except Exception:
+            return None
+
+        self._last_image_url = image_url
+        self._last_image_bytes = image_bytes
+        return image_bytes
+
+    @staticmethod
+    def _iter_image_urls(messages: List[Dict[str, Any]]):
+        """
+        Yield screenshot data URLs from messages, newest first.
+
+        Args:
+            messages: List of message dictionaries
+
+        Yields:
+            Image URL strings from user image items and computer call outputs
         """
         for message in reversed(messages):
             # Check user messages with content lists
             if message.get("role") == "user" and isinstance(message.get("content"), list):
                 for content_item in reversed(message["content"]):
                     if content_item.get("type") == "image_url":
-                        image_url = content_item.get("image_url", {}).get("url", "")
-                        if image_url.startswith("data:image/png;base64,"):
-                            base64_data = image_url.split(",", 1)[1]
-                            try:
-                                image_bytes = base64.b64decode(base64_data)
-                                return Image.open(io.BytesIO(image_bytes))
-                            except Exception:
-                                continue
+                        yield content_item.get("image_url", {}).get("url", "")
 
             # Check computer call outputs
             elif message.get("type") == "computer_call_output" and isinstance(message.get("output"), dict):
                 output = message["output"]
                 if output.get("type") == "input_image":
-                    image_url = output.get("image_url", "")
-                    if image_url.startswith("data:image/png;base64,"):
-                        base64_data = image_url.split(",", 1)[1]
-                        try:
-                            image_bytes = base64.b64decode(base64_data)
-                            return Image.open(io.BytesIO(image_bytes))
-                        except Exception:
-                            continue
+                    yield output.get("image_url", "")
+
+    def _extract_latest_screenshot(self, messages: List[Dict[str, Any]]) -> Optional[bytes]:
+        """
+        Extract the latest screenshot from messages.
+
+        Args:
+            messages: List of message dictionaries
+
+        Returns:
+            Raw PNG bytes of the latest screenshot, or None if not found
+        """
+        for image_url in self._iter_image_urls(messages):
+            image_bytes = self._decode_image_url(image_url)
+            if image_bytes is not None:
+                return image_bytes
 
         return None
 
-    async def _perform_ocr(self, image: Image.Image) -> Dict[int, Tuple[str, Tuple[int, int, int, int]]]:
+    async def _perform_ocr(self, image_bytes: bytes) -> OCRResults:
         """
         Perform OCR on an image and return results.
 
+        Results are cached by a hash of the raw screenshot bytes, so an unchanged
+        screen between steps skips the OCR engine entirely.
+
         Args:
-            image: PIL Image to process
+            image_bytes: Raw PNG bytes of the screenshot
 
         Returns:
-            Dict mapping ID to (content, bbox) tuples
+            Tuple of (contents, bboxes) lists, indexed by OCR ID
         """
-        await self._initialize_ocr_engine()
-
-        # Convert image to RGB and prepare for OCR
-        image_rgb = image.convert('RGB')
-        buffer = io.BytesIO()
-        image_rgb.save(buffer, format='PNG')
-        image_rgb_bytes = buffer.getvalue()
+        key = hashlib.blake2b(image_bytes, digest_size=16).digest()
+        cached = self._ocr_cache.get(key)
+        if cached is not None:
+            self._ocr_cache.move_to_end(key)
+            self._ocr_text = cached[1]
+            return cached[0]
 
-        # Perform OCR
         try:
-            result = self.ocr_engine(image_rgb_bytes)
-            text_list, bbox_list = check_ocr_result(result)
-
-            # Create ID -> (content, bbox) mapping
-            ocr_results = {}
-            for i, (content, bbox) in enumerate(zip(text_list, bbox_list)):
-                ocr_results[i] = (content, bbox)
-
+            pending = self._pending_ocr.get(key)
+            if pending is not None:
+                ocr_results, self._ocr_text = await pending
+            else:
+                ocr_results, self._ocr_text = await self._ocr_and_cache(key, image_bytes)
             return ocr_results
 
         except Exception as e:
             print(f"⚠️ OCR processing failed: {e}")
-            return {}
+            self._ocr_text = None
+            return [], []
+
+    async def _ocr_and_cache(self, key: bytes, image_bytes: bytes) -> Tuple[OCRResults, str]:
+        """
+        Run OCR on a screenshot and store the results in the LRU cache.
+
+        Args:
+            key: Cache key for the screenshot
+            image_bytes: Raw PNG bytes of the screenshot
+
+        Returns:
+            Tuple of ((contents, bboxes), formatted OCR text)
+        """
+        pool = await self._initialize_ocr_engine()
+
+        # Decode/resize and inference run in the worker process; its single
+        # worker also serialises access to the engine
+        try:
+            text_list, bbox_list = await asyncio.get_running_loop().run_in_executor(
+                pool, _run_ocr_in_worker, image_bytes, self.max_edge
+            )
+        except BrokenProcessPool:
+            # Worker died; start a fresh one on the next call
+            if self._ocr_pool is pool:
+                self.shutdown()
+            raise
+
+        # OCR ID is the position in both lists
+        ocr_results = (text_list, bbox_list)
+
+        ocr_text = self._format_ocr_text(text_list)
+        self._ocr_cache[key] = (ocr_results, ocr_text)
+        if len(self._ocr_cache) > self.cache_size:
+            self._ocr_cache.popitem(last=False)
+
+        return ocr_results, ocr_text
+
+    async def on_screenshot(self, screenshot: Union[str, bytes], name: str = "screenshot") -> None:
+        """
+        Start OCR as soon as a screenshot is taken.
+
+        The OCR runs in the background while the remaining callbacks (such as
+        the screenshot broadcast) do their work; the next on_llm_start picks up
+        the result instead of starting OCR from scratch.
+
+        Args:
+            screenshot: The screenshot image (base64 string or raw PNG bytes)
+            name: The name of the screenshot
+        """
+        try:
+            image_bytes = binascii.a2b_base64(screenshot) if isinstance(screenshot, str) else screenshot
+        except Exception:
+            return
+
+        key = hashlib.blake2b(image_bytes, digest_size=16).digest()
+        if key in self._ocr_cache or key in self._pending_ocr:
+            return
+
+        task = asyncio.create_task(self._ocr_and_cache(key, image_bytes))
+        self._pending_ocr[key] = task
 
-    def _format_ocr_text(self) -> str:
+        def _discard(done: asyncio.Task, key: bytes = key) -> None:
+            self._pending_ocr.pop(key, None)
+            if not done.cancelled():
+                # Failures surface when on_llm_start awaits the task; retrieve
+                # the exception here so an unused task doesn't warn
+                done.exception()
+
+        task.add_done_callback(_discard)
+
+    def _mark_image_url_seen(self, image_url: str) -> bool:
+        """
+        Record that a screenshot data URL has been handled.
+
+        Args:
+            image_url: Data URL string
+
+        Returns:
+            True if the URL was already recorded
+        """
+        if self._seen_image_urls.get(id(image_url)) is image_url:
+            return True
+        self._seen_image_urls[id(image_url)] = image_url
+        if len(self._seen_image_urls) > self.cache_size:
+            self._seen_image_urls.popitem(last=False)
+        return False
+
+    def _schedule_prefetch(self, messages: List[Dict[str, Any]]) -> None:
+        """
+        OCR older screenshots in the history that haven't been processed yet,
+        so a screen that returns to an earlier state is already cached.
+
+        Args:
+            messages: List of message dictionaries
+        """
+        if self.prefetch_frames <= 0:
+            return
+        if self._prefetch_task is not None and not self._prefetch_task.done():
+            return
+
+        pending = []
+        for image_url in self._iter_image_urls(messages):
+            if image_url is self._last_image_url or not image_url.startswith(_PNG_DATA_URL_PREFIX):
+                continue
+            if self._mark_image_url_seen(image_url):
+                continue
+            pending.append(image_url)
+            if len(pending) >= self.prefetch_frames:
+                break
+
+        if pending:
+            self._prefetch_task = asyncio.create_task(self._prefetch_ocr(pending))
+
+    async def _prefetch_ocr(self, image_urls: List[str]) -> None:
+        """
+        Populate the OCR cache for older screenshots. Failures are ignored.
+
+        RapidOCR has no multi-image batch API, so frames are submitted one at a
+        time; the next real OCR call queues behind at most one of them.
+
+        Args:
+            image_urls: Data URLs of the screenshots to OCR
+        """
+        for image_url in image_urls:
+            try:
+                image_bytes = binascii.a2b_base64(image_url[len(_PNG_DATA_URL_PREFIX):])
+                key = hashlib.blake2b(image_bytes, digest_size=16).digest()
+                if key not in self._ocr_cache:
+                    await self._ocr_and_cache(key, image_bytes)
+            except Exception:
+                continue
+
+    def _format_ocr_text(self, contents: Optional[List[str]] = None) -> str:
         """
         Format OCR results for inclusion in LLM prompt.
 
+        Args:
+            contents: OCR text contents indexed by ID (defaults to the latest results)
+
         Returns:
             Formatted string of OCR text elements
         """
-        if not self.ocr_results:
+        if contents is None:
+            contents = self.ocr_contents
+
+        if not contents:
             return "OCR-DETECTED TEXT ELEMENTS: None found"
 
-        lines = ["OCR-DETECTED TEXT ELEMENTS:"]
-        for ocr_id, (content, _) in self.ocr_results.items():
-            lines.append(f"ID {ocr_id}: \"{content}\"")
+        return "OCR-DETECTED TEXT ELEMENTS:\n" + "\n".join(
+            f"ID {ocr_id}: \"{content}\"" for ocr_id, content in enumerate(contents)
+        )
 
-        return "\n".join(lines)
+    @staticmethod
+    def _strip_ocr_section(text: str) -> str:
+        """
+        Remove an OCR-DETECTED TEXT ELEMENTS block from a text item.
+
+        Args:
+            text: Text content that may contain a previously injected OCR block
+
+        Returns:
+            The text before and after the OCR block, joined by a blank line
+        """
+        before, _, after = text.partition(_OCR_HEADER)
+        after_parts = after.split("\n\n", 1)
+        after = after_parts[1].strip() if len(after_parts) > 1 else ""
+        return "\n\n".join(part for part in (before.strip(), after) if part)
 
     def _inject_ocr_into_messages(self, messages: List[Dict[str, Any]], ocr_text: str) -> List[Dict[str, Any]]:
         """
-        Inject OCR text into the first user message, placing it after the latest image.
-        Removes any existing OCR text from previous messages to avoid accumulation.
+        Inject OCR text into the latest user message that carries a screenshot,
+        placing it right after that message's last image.
+
+        Only the target message is copied; every other message is passed through
+        untouched. If no user message has an image, the OCR text is prepended to
+        the first text item of the latest user message instead.
 
         Args:
             messages: Original messages
@@ -193,90 +615,53 @@ class OCRProcessorCallback(AsyncCallbackHandler):
         Returns:
             Modified messages with OCR text injected
         """
-        modified_messages = []
-
-        for message in messages:
-            if message.get("role") == "user" and isinstance(message.get("content"), list):
-                # First, clean out any existing OCR text from this message
-                cleaned_content = []
-                for content_item in message["content"]:
-                    if content_item.get("type") == "text":
-                        text = content_item.get("text", "")
-                        # Remove any existing OCR-DETECTED TEXT ELEMENTS sections
-                        if "OCR-DETECTED TEXT ELEMENTS:" in text:
-                            # Split by the OCR section and keep only the part before it
-                            parts = text.split("OCR-DETECTED TEXT ELEMENTS:")
-                            if len(parts) > 1:
-                                # Keep text before OCR section and any text after (but remove the OCR part)
-                                before_ocr = parts[0].strip()
-                                after_ocr_parts = parts[1].split("\n\n", 1)
-                                if len(after_ocr_parts) > 1:
-                                    after_ocr = after_ocr_parts[1].strip()
-                                    if before_ocr and after_ocr:
-                                        cleaned_content.append({
-                                            "type": "text",
-                                            "text": f"{before_ocr}\n\n{after_ocr}"
-                                        })
-                                    elif before_ocr:
-                                        cleaned_content.append({
-                                            "type": "text",
-                                            "text": before_ocr
-                                        })
-                                    elif after_ocr:
-                                        cleaned_content.append({
-                                            "type": "text",
-                                            "text": after_ocr
-                                        })
-                                elif before_ocr:
-                                    cleaned_content.append({
-                                        "type": "text",
-                                        "text": before_ocr
-                                    })
-                        else:
-                            cleaned_content.append(content_item)
-                    else:
-                        cleaned_content.append(content_item)
-
-                # Now inject new OCR text after the latest image
-                total_images = sum(1 for item in cleaned_content if item.get("type") == "image_url")
-
-                final_content = []
-                ocr_injected = False
-                images_seen = 0
-
-                # Process cleaned content items, injecting OCR after the last image
-                for content_item in cleaned_content:
-                    final_content.append(content_item)
+        target_idx = None
+        image_pos = None
+        fallback_idx = None
+
+        # Single reverse scan for the anchor: newest user message with an image
+        for msg_idx in range(len(messages) - 1, -1, -1):
+            message = messages[msg_idx]
+            content = message.get("content")
+            if message.get("role") != "user" or not isinstance(content, list):
+                continue
+            for item_idx in range(len(content) - 1, -1, -1):
+                if content[item_idx].get("type") == "image_url":
+                    target_idx, image_pos = msg_idx, item_idx
+                    break
+            if target_idx is not None:
+                break
+            if fallback_idx is None:
+                fallback_idx = msg_idx
+
+        if target_idx is None:
+            target_idx = fallback_idx
+        if target_idx is None:
+            return messages
 
-                    if content_item.get("type") == "image_url":
-                        images_seen += 1
-
-                        # If this is the last image and we haven't injected OCR yet, inject it after
-                        if images_seen == total_images and not ocr_injected:
-                            final_content.append({
-                                "type": "text",
-                                "text": f"\n{ocr_text}\n"
-                            })
-                            ocr_injected = True
-
-                # If no images found, inject at the beginning (fallback for initial messages)
-                if not ocr_injected:
-                    # Find first text item and prepend OCR
-                    for i, content_item in enumerate(final_content):
-                        if content_item.get("type") == "text":
-                            final_content[i] = {
-                                "type": "text",
-                                "text": f"{ocr_text}\n\n{content_item['text']}"
-                            }
-                            ocr_injected = True
-                            break
-
-                modified_message = message.copy()
-                modified_message["content"] = final_content
-                modified_messages.append(modified_message)
+        # Rebuild the target message's content, dropping any stale OCR block
+        new_content = []
+        for item_idx, content_item in enumerate(messages[target_idx]["content"]):
+            if content_item.get("type") == "text" and _OCR_HEADER in content_item.get("text", ""):
+                cleaned = self._strip_ocr_section(content_item["text"])
+                if cleaned:
+                    new_content.append({"type": "text", "text": cleaned})
             else:
-                modified_messages.append(message)
+                new_content.append(content_item)
+            if item_idx == image_pos:
+                new_content.append({"type": "text", "text": f"\n{ocr_text}\n"})
+
+        if image_pos is None:
+            for item_idx, content_item in enumerate(new_content):
+                if content_item.get("type") == "text":
+                    new_content[item_idx] = {
+                        "type": "text",
+                        "text": f"{ocr_text}\n\n{content_item['text']}"
+                    }
+                    break
 
+        modified_messages = list(messages)
+        modified_messages[target_idx] = {**messages[target_idx], "content": new_content}
         return modified_messages
 
     async def on_llm_start(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -297,14 +682,15 @@ class OCRProcessorCallback(AsyncCallbackHandler):
 
         # Perform OCR
         print("🔍 Performing OCR on screenshot...")
-        self.ocr_results = await self._perform_ocr(screenshot)
-        print(f"✅ OCR completed: found {len(self.ocr_results)} text elements")
+        self.ocr_contents, self.ocr_bboxes = await self._perform_ocr(screenshot)
+        print(f"✅ OCR completed: found {len(self.ocr_contents)} text elements")
+        self._mark_image_url_seen(self._last_image_url)
+        self._schedule_prefetch(messages)
 
         # Broadcast OCR results to UI if callback provided
         if self.broadcast_callback:
             ocr_results_list = []
-            for ocr_id, (content, bbox) in self.ocr_results.items():
-                x1, y1, x2, y2 = bbox
+            for ocr_id, (content, (x1, y1, x2, y2)) in enumerate(zip(self.ocr_contents, self.ocr_bboxes)):
                 ocr_results_list.append({
                     "id": str(ocr_id),
                     "text": content,
@@ -318,8 +704,8 @@ class OCRProcessorCallback(AsyncCallbackHandler):
                 })
             await self.broadcast_callback(ocr_results_list)
 
-        # Format OCR results for LLM
-        ocr_text = self._format_ocr_text()
+        # Format OCR results for LLM; the text is built once per unique screenshot
+        ocr_text = self._ocr_text if self._ocr_text is not None else self._format_ocr_text()
 
         # Inject OCR text into messages
         modified_messages = self._inject_ocr_into_messages(messages, ocr_text)
@@ -336,8 +722,8 @@ class OCRProcessorCallback(AsyncCallbackHandler):
         Returns:
             Tuple (x1, y1, x2, y2) or None if not found
         """
-        if ocr_id in self.ocr_results:
-            return self.ocr_results[ocr_id][1]
+        if 0 <= ocr_id < len(self.ocr_bboxes):
+            return self.ocr_bboxes[ocr_id]
         return None
 
     def get_ocr_content(self, ocr_id: int) -> Optional[str]:
@@ -350,6 +736,21 @@ class OCRProcessorCallback(AsyncCallbackHandler):
         Returns:
             Text content or None if not found
         """
-        if ocr_id in self.ocr_results:
-            return self.ocr_results[ocr_id][0]
+        if 0 <= ocr_id < len(self.ocr_contents):
+            return self.ocr_contents[ocr_id]
         return None
+
+    def get_ocr_target(self, ocr_id: int) -> Optional[Tuple[str, int, int]]:
+        """
+        Get content and click point for an OCR ID in a single lookup.
+
+        Args:
+            ocr_id: OCR element ID
+
+        Returns:
+            Tuple (content, center_x, center_y) or None if not found
+        """
+        if not 0 <= ocr_id < len(self.ocr_bboxes):
+            return None
+        x1, y1, x2, y2 = self.ocr_bboxes[ocr_id]
+        return self.ocr_contents[ocr_id], (x1 + x2) // 2, (y1 + y2) // 2
@@ -5,6 +5,7 @@ This callback broadcasts screenshots taken during agent execution to the UI via
 """
 
 import asyncio
+import hashlib
 from typing import Union, Callable, Awaitable, Optional
 from .base import AsyncCallbackHandler
 
@@ -14,17 +15,22 @@ class ScreenshotBroadcastCallback(AsyncCallbackHandler):
     Callback that broadcasts screenshots to the UI via WebSocket during agent execution.
     """
 
-    def __init__(self, broadcast_callback: Callable[[str, str], Awaitable[None]], agent_name: str = "SubAgent"):
+    def __init__(self, broadcast_callback: Callable[[Union[str, bytes], str], Awaitable[None]], agent_name: str = "SubAgent"):
         """
         Initialize the screenshot broadcast callback.
 
         Args:
-            broadcast_callback: Async function that takes (screenshot_b64, screenshot_type) and broadcasts it
+            broadcast_callback: Async function that takes (screenshot, screenshot_type) and broadcasts it;
+                the screenshot is passed through as received (raw PNG bytes or base64 string)
             agent_name: Name of the agent for identification in broadcasts
         """
         self.broadcast_callback = broadcast_callback
         self.agent_name = agent_name
 
+        # Last successfully broadcast screenshot, used to drop unchanged frames
+        self._last_digest: Optional[bytes] = None
+        self._last_b64: Optional[str] = None
+
     async def on_screenshot(self, screenshot: Union[str, bytes], name: str = "screenshot") -> None:
         """
         Called when a screenshot is taken during agent execution.
@@ -34,15 +40,23 @@ class ScreenshotBroadcastCallback(AsyncCallbackHandler):
             name: The name/type of the screenshot
         """
         try:
-            # Convert bytes to base64 string if needed
+            # Skip frames identical to the last one sent (e.g. idle waits)
             if isinstance(screenshot, bytes):
-                import base64
-                screenshot_b64 = base64.b64encode(screenshot).decode('utf-8')
+                digest = hashlib.blake2b(screenshot, digest_size=16).digest()
+                if digest == self._last_digest:
+                    return
+                last_b64 = None
             else:
-                screenshot_b64 = screenshot
+                if screenshot == self._last_b64:
+                    return
+                digest = None
+                last_b64 = screenshot
 
-            # Broadcast the screenshot with agent context
-            await self.broadcast_callback(screenshot_b64, f"{self.agent_name.lower()}_realtime")
+            # Broadcast the screenshot with agent context; raw bytes are sent
+            # as-is, without a base64 round trip
+            await self.broadcast_callback(screenshot, f"{self.agent_name.lower()}_realtime")
+            self._last_digest = digest
+            self._last_b64 = last_b64
 
             print(f"📡 [{self.agent_name}] Broadcasted real-time screenshot ({name})")
 
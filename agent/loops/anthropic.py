@@ -1310,7 +1310,10 @@ def _convert_completion_to_responses_items(response: Any) -> List[Dict[str, Any]
 def _add_cache_control(completion_messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Add cache control to completion messages"""
     num_writes = 0
-    for message in completion_messages:
+    # Anthropic caches the whole prefix up to a breakpoint, so mark the newest
+    # messages: the next turn then hits the cache for everything sent so far
+    # instead of only for the first few messages of the conversation
+    for message in reversed(completion_messages):
         message["cache_control"] = { "type": "ephemeral" }
         num_writes += 1
         # Cache control has a maximum of 4 blocks
@@ -0,0 +1,25 @@
+"""
+System prompts for the CoAct-1 agents.
+
+Prompt files are read once per process and cached, so spawning agents
+repeatedly doesn't hit the disk again.
+"""
+
+import functools
+from pathlib import Path
+
+PROMPTS_DIR = Path(__file__).resolve().parent
+
+
+@functools.lru_cache(maxsize=None)
+def load_prompt(name: str) -> str:
+    """
+    Load an agent prompt by name.
+
+    Args:
+        name: Prompt name without extension (e.g. "GUIOperator")
+
+    Returns:
+        Contents of ``agent_prompts/<name>.txt``
+    """
+    return (PROMPTS_DIR / f"{name}.txt").read_text()
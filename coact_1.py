@@ -12,13 +12,26 @@ The system consists of three agents:
 """
 
 import asyncio
+import atexit
+import base64
+import binascii
+import hashlib
+import io
+import itertools
 import os
 import sys
 import logging
-import json
+import logging.handlers
+import queue
+import httpx
+import litellm
+import numpy as np
+import orjson
 import websockets
-import functools
-from typing import List, Dict, Any, Optional, Set, Tuple
+from collections import OrderedDict
+from typing import List, Dict, Any, NamedTuple, Optional, Set, Tuple, Union
+from PIL import Image
+from websockets.extensions.permessage_deflate import ServerPerMessageDeflateFactory
 
 # Import CUA components
 from agent import ComputerAgent
@@ -26,23 +39,208 @@ from computer import Computer, VMProviderType
 # from agent.callbacks import AsyncCallbackHandler
 # from agent.computers.base import AsyncComputerHandler
 from agent.computers.cua import cuaComputerHandler
+from agent.callbacks.ocr_processor import OCRProcessorCallback
 
 # Import agent modules
 from orchestrator import OrchestratorTools, create_orchestrator
 from Programmer import ProgrammerTools, create_programmer
 from GUIOperator import create_gui_operator
-
-# Set up logging
-logging.basicConfig(level=logging.WARNING)
+from model_support import supports_webp
+
+# Set up logging. Handlers only enqueue records; a listener thread does the
+# writing, so logging from broadcast paths never blocks the event loop on stdout
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+logging.basicConfig(level=logging.WARNING, handlers=[logging.handlers.QueueHandler(_log_queue)])
+_log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler())
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger(__name__)
 
+# Prompt text used when building orchestrator and sub-agent messages
+NEXT_SUBTASK_PROMPT = "What is the next subtask based on the current progress? (or you can call task_completed)"
+EVALUATE_PROMPT = "Evaluate whether the sub-task was successful and determine the next subtask (or you can call task_completed)."
+SCREEN_STATE_TEXT = "Here is the current screen state."
+SCREEN_STATE_CAPTION = "Here is the current screen state:"
+SCREEN_UNCHANGED_TEXT = "No visible UI change: the screen is identical to the previous screenshot."
+NEXT_SUBTASK_PART = {"type": "text", "text": NEXT_SUBTASK_PROMPT}
+CONDENSED_STEPS_HEADER = "Earlier steps (condensed):"
+
+
+def image_part(url: str) -> Dict[str, Any]:
+    """Message content part embedding an image data URL."""
+    return {"type": "image_url", "image_url": {"url": url}}
+
+
+# Agent states before anything has been broadcast
+IDLE_AGENT_STATE = {"orchestrator": "idle", "programmer": "idle", "gui_operator": "idle", "grounding_model": "idle"}
+
+# Content item types that mark an assistant message as a tool call rather than a reply
+FUNCTION_CALL_TYPES = frozenset({"tool_use", "function_call"})
+
+
+def encode_llm_data_url(png: bytes, max_edge: Optional[int] = None, webp: bool = False) -> Optional[str]:
+    """
+    Re-encode a PNG screenshot for an LLM prompt.
+
+    Args:
+        png: PNG screenshot bytes
+        max_edge: Downscale so the longest side is at most this many pixels
+            (aspect ratio preserved; None keeps full resolution)
+        webp: Encode as lossless WebP instead of PNG
+
+    Returns:
+        Data URL of the re-encoded image, or None if the original PNG can be
+        used unchanged (or re-encoding failed)
+    """
+    try:
+        image = Image.open(io.BytesIO(png))
+        resized = bool(max_edge) and max(image.size) > max_edge
+        if not resized and not webp:
+            return None
+        if resized:
+            # BILINEAR is much cheaper than LANCZOS and fine for UI screenshots
+            image.thumbnail((max_edge, max_edge), Image.BILINEAR)
+
+        buffer = io.BytesIO()
+        if webp:
+            # method=0 is the fastest encoder setting; lossless keeps UI text exact
+            image.save(buffer, format="WEBP", lossless=True, method=0)
+            mime_type = "image/webp"
+        else:
+            image.save(buffer, format="PNG")
+            mime_type = "image/png"
+    except Exception as e:
+        print(f"⚠️ Screenshot re-encoding failed, using original PNG: {e}")
+        return None
+    return f"data:{mime_type};base64,{base64.b64encode(buffer.getvalue()).decode('ascii')}"
+
+
+def configure_litellm_http_client() -> None:
+    """
+    Share one pooled HTTP client across all litellm calls in the process.
+
+    The orchestrator and both sub-agents call their models through litellm;
+    with a shared keep-alive pool (HTTP/2, so concurrent calls to the same
+    provider multiplex over one connection) later calls skip the DNS lookup
+    and TLS handshake. A client configured elsewhere is left in place.
+    """
+    if litellm.aclient_session is None:
+        litellm.aclient_session = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+            timeout=httpx.Timeout(600.0, connect=10.0),
+        )
+
+
+def encode_ui_preview(png: bytes, max_edge: Optional[int] = None, quality: int = 80) -> Optional[bytes]:
+    """
+    Re-encode a PNG screenshot as a lossy WebP preview for the UI.
+
+    WebP is noticeably smaller than JPEG at the same quality and much cheaper
+    to produce than PNG; method 4 trades a little size for encode speed.
+
+    Args:
+        png: PNG screenshot bytes
+        max_edge: Downscale so the longest side is at most this many pixels
+            (aspect ratio preserved; None keeps full resolution)
+        quality: WebP quality
+
+    Returns:
+        WebP bytes, or None if re-encoding failed
+    """
+    try:
+        image = Image.open(io.BytesIO(png))
+        if max_edge and max(image.size) > max_edge:
+            image.thumbnail((max_edge, max_edge), Image.BILINEAR)
+        buffer = io.BytesIO()
+        image.convert("RGB").save(buffer, format="WEBP", quality=quality, method=4)
+    except Exception as e:
+        print(f"⚠️ Screenshot preview encoding failed, sending original PNG: {e}")
+        return None
+    return buffer.getvalue()
+
+
+def crop_to_changed_region(previous_png: bytes, current_png: bytes, threshold: int = 24, block: int = 16,
+                           pad: int = 32, max_fraction: float = 0.6) -> Optional[Tuple[str, Tuple[int, int, int, int]]]:
+    """
+    Crop a screenshot to the region that changed since an earlier one.
+
+    Pixels whose summed RGB difference exceeds ``threshold`` count as changed.
+    The mask is pooled into ``block``-sized cells and cells with fewer than
+    ``block`` changed pixels are dropped, which filters isolated specks such
+    as a blinking caret or anti-aliasing noise.
+
+    Args:
+        previous_png: PNG bytes of the earlier screenshot
+        current_png: PNG bytes of the current screenshot
+        threshold: Per-pixel change threshold
+        block: Cell size in pixels for noise filtering
+        pad: Padding in pixels added around the changed region
+        max_fraction: Give up if the region covers more than this fraction of the screen
+
+    Returns:
+        PNG data URL of the crop and its (left, top, right, bottom) box, or None
+        if nothing meaningful changed, most of the screen changed, or the
+        screenshots can't be compared
+    """
+    try:
+        previous = np.asarray(Image.open(io.BytesIO(previous_png)).convert("RGB"), dtype=np.int16)
+        current_image = Image.open(io.BytesIO(current_png)).convert("RGB")
+        current = np.asarray(current_image, dtype=np.int16)
+        if previous.shape != current.shape:
+            return None
+
+        mask = np.abs(current - previous).sum(axis=2) > threshold
+        height, width = mask.shape
+        rows, cols = -(-height // block), -(-width // block)
+        padded = np.zeros((rows * block, cols * block), dtype=bool)
+        padded[:height, :width] = mask
+        cells = padded.reshape(rows, block, cols, block).sum(axis=(1, 3)) >= block
+        cell_rows, cell_cols = np.nonzero(cells)
+        if cell_rows.size == 0:
+            return None
+
+        left = max(int(cell_cols.min()) * block - pad, 0)
+        top = max(int(cell_rows.min()) * block - pad, 0)
+        right = min((int(cell_cols.max()) + 1) * block + pad, width)
+        bottom = min((int(cell_rows.max()) + 1) * block + pad, height)
+        if (right - left) * (bottom - top) > max_fraction * width * height:
+            return None
+
+        buffer = io.BytesIO()
+        current_image.crop((left, top, right, bottom)).save(buffer, format="PNG")
+    except Exception as e:
+        print(f"⚠️ Screenshot diff failed, using the full screenshot: {e}")
+        return None
+    url = f"data:image/png;base64,{base64.b64encode(buffer.getvalue()).decode('ascii')}"
+    return url, (left, top, right, bottom)
+
+
+class Screenshot(NamedTuple):
+    """A captured screenshot in the encodings the run needs."""
+    png: bytes  # Raw PNG bytes (UI broadcasts are sent from these)
+    llm_url: str  # Data URL sized and encoded for the orchestrator model
+    llm_url_is_png: bool = False  # llm_url is the unmodified full-resolution PNG
+
+    @property
+    def png_url(self) -> str:
+        """Full-resolution PNG data URL for sub-agents, whose OCR/grounding expect PNG."""
+        if self.llm_url_is_png:
+            # Same image as the orchestrator's copy, so share that string
+            return self.llm_url
+        # Built only when a sub-agent prompt needs it rather than kept alongside the bytes
+        return f"data:image/png;base64,{base64.b64encode(self.png).decode('ascii')}"
+
+
 # --- CoAct-1 System ---
 
 class CoAct1:
     """
     Implements the CoAct-1 multi-agent system.
     """
-    def __init__(self, computer: Computer, orchestrator_model: str, programmer_model: str, gui_operator_model: str, websocket_port: int = 8765):
+    def __init__(self, computer: Computer, orchestrator_model: str, programmer_model: str, gui_operator_model: str, websocket_port: int = 8765,
+                 orchestrator_max_edge: Optional[int] = 1280, orchestrator_history_steps: Optional[int] = 6,
+                 orchestrator_history_images: Optional[int] = 2, ui_preview_max_edge: Optional[int] = 1280):
         self.computer = computer
 
         # Store model names
@@ -53,7 +251,44 @@ class CoAct1:
         # WebSocket server for real-time updates
         self.websocket_port = websocket_port
         self.websocket_clients: Set[websockets.WebSocketServerProtocol] = set()
+        # Immutable snapshot of websocket_clients for broadcasts, rebuilt only when
+        # a client joins or leaves rather than copied on every send
+        self._client_snapshot: Tuple[websockets.WebSocketServerProtocol, ...] = ()
         self.websocket_server = None
+        self._screenshot_send_lock = asyncio.Lock()
+        # Set once a UI client has connected, so run() only waits as long as needed
+        self._first_client = asyncio.Event()
+        # Agent states last broadcast to the UI, to skip unchanged updates
+        self._last_agent_state: Optional[Dict[str, str]] = None
+
+        # Screenshots may be started ahead of when they're needed; keep at most
+        # one request in flight against the computer handler
+        self._screenshot_semaphore = asyncio.Semaphore(1)
+
+        # Content-addressed screenshots for the current run: sha256 -> Screenshot
+        self._screenshot_store: Dict[bytes, Screenshot] = {}
+        # Most recent screenshot taken, kept at capture time so the run never
+        # has to search a history for it
+        self._latest_screenshot: Optional[Screenshot] = None
+        # Connection of the orchestrator's computer handler, started by the first run
+        self._handler_init: Optional[asyncio.Task] = None
+        # Fallback call IDs for delegations the model returned without one
+        self._call_id_counter = itertools.count(1)
+        self._orchestrator_webp = supports_webp(orchestrator_model)
+        # The orchestrator only plans, so it gets screenshots downscaled towards
+        # the vision encoder's native resolution; sub-agents that act on pixel
+        # coordinates keep full resolution
+        self.orchestrator_max_edge = orchestrator_max_edge
+        # Screenshots broadcast to the UI are sent as downscaled WebP previews
+        # (None sends the original PNG); previews of recent frames are cached
+        self.ui_preview_max_edge = ui_preview_max_edge
+        self._ui_preview_cache: "OrderedDict[bytes, bytes]" = OrderedDict()
+        # Bound the orchestrator prompt: older delegations are condensed into a
+        # text note and only the most recent screenshots are resent
+        self.orchestrator_history_steps = orchestrator_history_steps
+        self.orchestrator_history_images = orchestrator_history_images
+
+        configure_litellm_http_client()
 
         # The cuaComputerHandler is the component that translates agent actions
         # into calls on the computer interface. We can reuse it.
@@ -84,14 +319,33 @@ class CoAct1:
         # Start WebSocket server for real-time updates
         self.start_websocket_server()
 
+    def _add_client(self, websocket):
+        """Register a connected client."""
+        self.websocket_clients.add(websocket)
+        self._client_snapshot = tuple(self.websocket_clients)
+
+    def _remove_client(self, websocket):
+        """Forget a client; safe to call for a client that is already gone."""
+        if websocket in self.websocket_clients:
+            self.websocket_clients.discard(websocket)
+            self._client_snapshot = tuple(self.websocket_clients)
+
     async def websocket_handler(self, websocket):
         """Handle WebSocket connections for real-time updates."""
         print(f"📡 New WebSocket connection from {websocket.remote_address}")
-        self.websocket_clients.add(websocket)
+        self._add_client(websocket)
+        self._first_client.set()
         try:
+            # Bring the new client up to date with the agent states already sent;
+            # the others don't need the event again
+            if self._last_agent_state is not None:
+                try:
+                    await websocket.send(self._event_message("agent_state", self._last_agent_state))
+                except websockets.ConnectionClosed:
+                    pass
             await websocket.wait_closed()
         finally:
-            self.websocket_clients.remove(websocket)
+            self._remove_client(websocket)
             print(f"📡 WebSocket connection closed for {websocket.remote_address}")
 
             # Broadcast UI reset when connection is lost
@@ -107,13 +361,23 @@ class CoAct1:
         """Initialize the WebSocket server for real-time updates."""
         print(f"🚀 Initializing WebSocket server on port {self.websocket_port}")
 
-        # Use functools.partial to bind the instance method
-        handler = functools.partial(self.websocket_handler)
-
+        # JSON events (OCR results, function calls) compress well; screenshots
+        # are already WebP, so favour deflate speed over ratio to keep the cost
+        # of compressing them low
         self.websocket_server = websockets.serve(
-            handler,
+            self.websocket_handler,
             "localhost",
-            self.websocket_port
+            self.websocket_port,
+            compression=None,
+            extensions=[ServerPerMessageDeflateFactory(
+                server_max_window_bits=15,
+                compress_settings={"level": 1},
+            )],
+            max_size=2**24,
+            # Bound what a slow client can buffer, and detect dead ones
+            write_limit=2**20,
+            ping_interval=20,
+            ping_timeout=10
         )
 
     async def start_websocket_server_async(self):
@@ -139,53 +403,175 @@ class CoAct1:
         })
         print("🔄 Broadcasted UI reset due to server shutdown")
 
-        # Close all client connections
-        for client in self.websocket_clients.copy():
+        # Close all client connections at once with "going away" (1001), so one
+        # unresponsive client can't stall shutdown
+        async def close(client):
             try:
-                await client.close()
-            except Exception:
-                pass
+                await client.close(code=1001)
+            except Exception as e:
+                logger.debug("⚠️ Error closing WebSocket client: %s", e)
+
+        try:
+            async with asyncio.timeout(2.0):
+                async with asyncio.TaskGroup() as close_tasks:
+                    for client in self._client_snapshot:
+                        close_tasks.create_task(close(client))
+        except TimeoutError:
+            print("⚠️ Timed out closing WebSocket clients")
 
         self.websocket_clients.clear()
+        self._client_snapshot = ()
         print("🧹 WebSocket server stopped")
 
-    async def broadcast_event(self, event_type: str, data: Dict[str, Any]):
-        """Broadcast an event to all connected WebSocket clients."""
-        print(f"📡 Broadcasting event: {event_type} to {len(self.websocket_clients)} clients")
-        if not self.websocket_clients:
-            print("⚠️ No WebSocket clients connected")
-            return
+    def shutdown_ocr_workers(self):
+        """Stop the GUI Operator's OCR worker process."""
+        for callback in self.gui_operator.callbacks:
+            if isinstance(callback, OCRProcessorCallback):
+                callback.shutdown()
 
+    @staticmethod
+    def _event_message(event_type: str, data: Dict[str, Any]) -> str:
+        """Serialize an event for the UI."""
         message = {
             "type": event_type,
             "data": data,
             "timestamp": asyncio.get_event_loop().time()
         }
 
-        # Convert message to JSON
-        json_message = json.dumps(message)
+        # Convert message to JSON; websockets sends str as a text frame, which
+        # keeps binary frames reserved for screenshot payloads
+        return orjson.dumps(message).decode()
 
-        # Send to all connected clients
-        disconnected_clients = set()
-        for client in self.websocket_clients:
-            try:
-                await client.send(json_message)
-                print(f"✅ Sent to client: {client.remote_address}")
-            except Exception as e:
-                print(f"⚠️ Failed to send message to client: {e}")
-                disconnected_clients.add(client)
-
-        # Remove disconnected clients
-        for client in disconnected_clients:
-            self.websocket_clients.discard(client)
-
-    async def broadcast_screenshot(self, screenshot_b64: str, screenshot_type: str = "current"):
-        """Broadcast screenshot data to UI."""
-        await self.broadcast_event("screenshot_update", {
-            "screenshot_type": screenshot_type,
-            "screenshot_data": screenshot_b64,
-            "timestamp": asyncio.get_event_loop().time()
-        })
+    async def broadcast_event(self, event_type: str, data: Dict[str, Any]):
+        """Broadcast an event to all connected WebSocket clients."""
+        logger.debug("📡 Broadcasting event: %s to %d clients", event_type, len(self.websocket_clients))
+        if not self.websocket_clients:
+            logger.debug("⚠️ No WebSocket clients connected")
+            return
+
+        json_message = self._event_message(event_type, data)
+
+        # Send to all connected clients. websockets.broadcast encodes the frame
+        # once and writes it to every open connection without waiting on any of
+        # them; connections that are closing are skipped and then removed by
+        # websocket_handler
+        websockets.broadcast(self._client_snapshot, json_message)
+        logger.debug("✅ Sent to %d clients", len(self.websocket_clients))
+
+    async def _send_to_clients(self, *frames: Union[str, bytes], timeout: Optional[float] = None) -> int:
+        """
+        Send frames, in order, to every connected client concurrently.
+
+        A slow client only delays its own connection instead of every client
+        after it; clients whose send fails are dropped.
+
+        Args:
+            *frames: Frames to send
+            timeout: Seconds a client may take to accept all frames before it
+                is disconnected (None waits indefinitely)
+
+        Returns:
+            Number of clients that received all frames
+        """
+        clients = self._client_snapshot
+
+        async def send(client):
+            for frame in frames:
+                await client.send(frame)
+
+        results = await asyncio.gather(
+            *(asyncio.wait_for(send(client), timeout) for client in clients),
+            return_exceptions=True
+        )
+        sent = 0
+        for client, result in zip(clients, results):
+            if isinstance(result, TimeoutError):
+                # The client's write buffer is full; a half-sent frame leaves the
+                # connection unusable, so drop it and let the UI reconnect
+                logger.warning("⚠️ Client %s too slow, disconnecting", client.remote_address)
+                self._remove_client(client)
+                client.transport.abort()
+            elif isinstance(result, BaseException):
+                logger.warning("⚠️ Failed to send message to client: %s", result)
+                self._remove_client(client)
+            else:
+                sent += 1
+        return sent
+
+    async def broadcast_screenshot(self, screenshot: Union[str, bytes], screenshot_type: str = "current",
+                                   send_timeout: float = 0.5):
+        """
+        Broadcast screenshot data to UI.
+
+        Each screenshot is sent as a small JSON ``screenshot_update`` header
+        followed by a binary frame with the image bytes, avoiding the base64
+        inflation and the multi-megabyte JSON string. Unless
+        ``ui_preview_max_edge`` is None, the image is a downscaled WebP preview
+        rather than the full-resolution PNG.
+
+        A client that cannot take a screenshot within ``send_timeout`` seconds
+        is disconnected rather than left to queue stale frames; the UI
+        reconnects and picks up from the next screenshot.
+        """
+        logger.debug("📡 Broadcasting screenshot: %s to %d clients", screenshot_type, len(self.websocket_clients))
+        if not self.websocket_clients:
+            return
+
+        image_bytes = binascii.a2b_base64(screenshot) if isinstance(screenshot, str) else screenshot
+        mime_type = "image/png"
+        if self.ui_preview_max_edge:
+            preview = await self._ui_preview(image_bytes)
+            if preview is not None:
+                image_bytes, mime_type = preview, "image/webp"
+
+        timestamp = asyncio.get_event_loop().time()
+        header = orjson.dumps({
+            "type": "screenshot_update",
+            "data": {
+                "screenshot_type": screenshot_type,
+                "mime_type": mime_type,
+                "byte_length": len(image_bytes),
+                "timestamp": timestamp
+            },
+            "timestamp": timestamp
+        }).decode()
+
+        # Header and binary frame must stay adjacent on every connection, so
+        # concurrent screenshot broadcasts are serialised
+        async with self._screenshot_send_lock:
+            await self._send_to_clients(header, image_bytes, timeout=send_timeout)
+
+    async def _ui_preview(self, png: bytes) -> Optional[bytes]:
+        """WebP preview of a PNG screenshot for the UI, reused while the screen is unchanged."""
+        digest = hashlib.blake2b(png, digest_size=16).digest()
+        preview = self._ui_preview_cache.get(digest)
+        if preview is None:
+            preview = await asyncio.to_thread(encode_ui_preview, png, self.ui_preview_max_edge)
+            if preview is None:
+                return None
+            self._ui_preview_cache[digest] = preview
+            if len(self._ui_preview_cache) > 8:
+                self._ui_preview_cache.popitem(last=False)
+        else:
+            self._ui_preview_cache.move_to_end(digest)
+        return preview
+
+    async def _set_agent_state(self, **states: str):
+        """
+        Update agent states in the UI.
+
+        Only the given agents change; the rest keep the state last sent. The
+        ``agent_state`` event is skipped when nothing actually changed.
+
+        Args:
+            **states: New state ("idle" or "processing") per agent key
+                (orchestrator, programmer, gui_operator, grounding_model)
+        """
+        state = {**(self._last_agent_state or IDLE_AGENT_STATE), **states}
+        if state == self._last_agent_state:
+            return
+        self._last_agent_state = state
+        await self.broadcast_event("agent_state", state)
 
     async def broadcast_ocr_results(self, ocr_results: List[Dict[str, Any]]):
         """Broadcast OCR results to UI."""
@@ -199,20 +585,10 @@ class CoAct1:
         # Set grounding model as processing when starting, idle when complete
         if coordinates is None:
             # Starting grounding
-            await self.broadcast_event("agent_state", {
-                "orchestrator": "idle",
-                "programmer": "idle",
-                "gui_operator": "idle",
-                "grounding_model": "processing"
-            })
+            await self._set_agent_state(gui_operator="idle", grounding_model="processing")
         else:
             # Grounding completed, set GUI operator back to processing
-            await self.broadcast_event("agent_state", {
-                "orchestrator": "idle",
-                "programmer": "idle",
-                "gui_operator": "processing",
-                "grounding_model": "idle"
-            })
+            await self._set_agent_state(gui_operator="processing", grounding_model="idle")
 
         await self.broadcast_event("grounding_update", {
             "model_name": model_name,
@@ -233,24 +609,184 @@ class CoAct1:
         })
 
 
+    async def _initialize_handler(self):
+        """Connect the orchestrator's computer handler, if it needs connecting."""
+        initialize = getattr(self.orchestrator_tools._handler, "_initialize", None)
+        if initialize is not None:
+            await initialize()
+
+    async def _take_screenshot(self) -> Screenshot:
+        """
+        Take a screenshot through the orchestrator's computer handler.
+
+        Screenshots are stored by content hash, so an unchanged screen reuses
+        the same bytes and data URL string instead of keeping another
+        multi-megabyte copy alive in the histories. The base64 from the handler
+        is decoded once here; only the orchestrator's data URL is kept in base64
+        form. The orchestrator copy is
+        downscaled to ``orchestrator_max_edge`` and, for models that accept
+        WebP, re-encoded as lossless WebP, which is considerably smaller than
+        PNG for screen content.
+
+        Returns:
+            The screenshot as raw PNG bytes and its orchestrator data URL
+        """
+        async with self._screenshot_semaphore:
+            screenshot_b64 = await self.orchestrator_tools._handler.screenshot()
+
+        png = binascii.a2b_base64(screenshot_b64)
+        digest = hashlib.sha256(png).digest()
+        entry = self._screenshot_store.get(digest)
+        if entry is None:
+            llm_url = None
+            if self._orchestrator_webp or self.orchestrator_max_edge:
+                llm_url = await asyncio.to_thread(
+                    encode_llm_data_url, png, self.orchestrator_max_edge, self._orchestrator_webp
+                )
+            if llm_url is None:
+                entry = Screenshot(png, f"data:image/png;base64,{screenshot_b64}", llm_url_is_png=True)
+            else:
+                entry = Screenshot(png, llm_url)
+            self._screenshot_store[digest] = entry
+        self._latest_screenshot = entry
+        return entry
+
+    def _compact_orchestrator_history(self, task: str, history: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Keep the orchestrator prompt roughly constant in size as steps accumulate.
+
+        Once the history carries more than twice ``orchestrator_history_images``
+        screenshots, all but the most recent ``orchestrator_history_images`` are
+        dropped from the turns that carried them. Once it holds more than
+        ``orchestrator_history_steps`` delegations, the oldest are folded into a
+        single text note (task, subtasks and their results, including the steps
+        of any earlier note) and the newest half is kept verbatim. Both are done
+        in batches rather than every step, so the prompt prefix stays stable
+        between them for prompt caching.
+
+        Args:
+            task: The user task the run is working on
+            history: The orchestrator conversation history
+
+        Returns:
+            The compacted history
+        """
+        if self.orchestrator_history_images is not None:
+            image_turns = []
+            for idx, item in enumerate(history):
+                key = "output" if item.get("type") == "function_call_output" else "content"
+                content = item.get(key)
+                if isinstance(content, list) and any(part.get("type") == "image_url" for part in content):
+                    image_turns.append((idx, key))
+            if len(image_turns) > 2 * self.orchestrator_history_images:
+                drop = len(image_turns) - self.orchestrator_history_images
+                for idx, key in image_turns[:drop]:
+                    item = history[idx]
+                    history[idx] = {**item, key: [part for part in item[key] if part.get("type") != "image_url"]}
+
+        if self.orchestrator_history_steps is None:
+            return history
+
+        delegation_indices = [idx for idx, item in enumerate(history) if item.get("type") == "function_call"]
+        if len(delegation_indices) <= self.orchestrator_history_steps:
+            return history
+
+        keep = max(1, self.orchestrator_history_steps // 2)
+        cut = delegation_indices[-keep]
+        if cut > 0 and history[cut - 1].get("role") == "user":
+            # Keep the prompt that led to the first retained delegation with it
+            cut -= 1
+
+        results = {}
+        for item in history[:cut]:
+            if item.get("type") == "function_call_output":
+                output = item.get("output")
+                if isinstance(output, list):
+                    output = " ".join(part.get("text", "") for part in output if part.get("type") == "text")
+                results[item.get("call_id")] = output
+
+        note = [f"{task}\n", CONDENSED_STEPS_HEADER]
+        for item in history[:cut]:
+            content = item.get("content")
+            if item.get("role") == "user" and isinstance(content, str) and CONDENSED_STEPS_HEADER in content:
+                # Carry over the steps condensed by an earlier compaction
+                note.extend(content.split(CONDENSED_STEPS_HEADER, 1)[1].strip("\n").splitlines())
+                continue
+            if item.get("type") != "function_call":
+                continue
+            function_info = item.get("function", item)
+            arguments = function_info.get("arguments", {})
+            if isinstance(arguments, str):
+                arguments = orjson.loads(arguments)
+            subtask = arguments.get("subtask") or "; ".join(f"{name}: {value}" for name, value in arguments.items())
+            note.append(f"- {function_info.get('name')}: {subtask}")
+            result = results.get(item.get("call_id"))
+            if result:
+                note.append(f"  Result: {result}")
+
+        print(f"   🗜️ Condensed {len(delegation_indices) - keep} earlier orchestrator steps")
+        return [{"role": "user", "content": "\n".join(note)}] + history[cut:]
+
+    async def _run_sub_agent(self, sub_agent: ComputerAgent, subtask: str, screenshot_url: Optional[str],
+                             screenshot_caption: str = SCREEN_STATE_CAPTION) -> str:
+        """
+        Run a sub-agent on a subtask until it finishes.
+
+        Args:
+            sub_agent: The Programmer or GUI Operator agent
+            subtask: The subtask delegated by the orchestrator
+            screenshot_url: Data URL of the current screen to include, if any
+            screenshot_caption: Text introducing the screenshot
+
+        Returns:
+            The sub-agent's final completion message
+        """
+        if screenshot_url is not None:
+            sub_agent_history = [{
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": f"{subtask}\n\n{screenshot_caption}"},
+                    image_part(screenshot_url)
+                ]
+            }]
+            print("   🖼️ Provided image context to sub-agent")
+        else:
+            sub_agent_history = [{"role": "user", "content": subtask}]
+
+        async for result in sub_agent.run(sub_agent_history):
+            sub_agent_history.extend(result.get("output", []))
+
+        # Extract the sub-agent's final completion message
+        print("📝 Extracting sub-agent completion message...")
+        final_message = self._extract_sub_agent_final_message(sub_agent_history)
+        print(f"Final message: {final_message}")
+        return final_message
+
     def _extract_sub_agent_final_message(self, history: List[Dict[str, Any]]) -> str:
         """Extract the final message from a sub-agent's conversation history."""
-        # Look for the last assistant message that doesn't contain function calls
+        # Look for the last assistant message that doesn't contain function calls,
+        # checking its structure rather than stringifying it (which could mean
+        # copying embedded base64 images)
         for message in reversed(history):
-            if message.get("role") == "assistant":
-                content = message.get("content", "")
-                # Check if this message contains function calls
-                has_function_calls = False
-                if isinstance(content, list):
-                    for item in content:
-                        if item.get("type") == "tool_use" or item.get("type") == "function_call":
-                            has_function_calls = True
-                            break
-                elif "function_call" in str(content) or "tool_use" in str(content):
-                    has_function_calls = True
+            if message.get("role") != "assistant":
+                continue
+            content = message.get("content")
+            if not content:
+                continue
 
-                # If no function calls, this is the final completion message
-                if not has_function_calls and content:
+            if isinstance(content, list):
+                if any(item.get("type") in FUNCTION_CALL_TYPES for item in content):
+                    continue
+                # Responses-format content: hand the orchestrator the text
+                # itself rather than the repr of the content parts
+                text = "\n".join(item["text"] for item in content if item.get("text"))
+                if text:
+                    return text
+            elif isinstance(content, str):
+                if not any(call_type in content for call_type in FUNCTION_CALL_TYPES):
+                    return content
+            elif isinstance(content, dict):
+                if content.get("type") not in FUNCTION_CALL_TYPES:
                     return str(content)
 
         # Fallback: return the last message content
@@ -263,8 +799,28 @@ class CoAct1:
         # Start WebSocket server for real-time updates
         await self.start_websocket_server_async()
 
-        # Wait a moment for frontend to connect
-        await asyncio.sleep(2)
+        # Connect to the computer while waiting for the frontend. This happens
+        # once per instance; later runs reuse the finished task unless it failed
+        handler_init = self._handler_init
+        if handler_init is None or (handler_init.done() and (handler_init.cancelled() or handler_init.exception() is not None)):
+            handler_init = self._handler_init = asyncio.create_task(self._initialize_handler())
+
+        # Give the frontend up to 2 seconds to connect, but no longer than it takes
+        try:
+            await asyncio.wait_for(self._first_client.wait(), timeout=2.0)
+        except asyncio.TimeoutError:
+            print("⚠️ No frontend connected yet, continuing")
+
+        await handler_init
+
+        orchestrator_history: List[Dict[str, Any]] = []
+        # Screenshot the previous delegation started from, to crop later ones to what changed
+        previous_screenshot: Optional[Screenshot] = None
+        self._screenshot_store.clear()
+        self._latest_screenshot = None
+
+        # Take the first screenshot while the start of the run is broadcast
+        first_screenshot_task = asyncio.create_task(self._take_screenshot())
 
         # Broadcast the original user task assigned to Orchestrator
         print(f"📡 Broadcasting user_task_started: {task}")
@@ -274,180 +830,246 @@ class CoAct1:
         })
 
         # Set orchestrator as processing
-        await self.broadcast_event("agent_state", {
-            "orchestrator": "processing",
-            "programmer": "idle",
-            "gui_operator": "idle",
-            "grounding_model": "idle"
-        })
-        if hasattr(self.orchestrator_tools._handler, '_initialize'):
-            await self.orchestrator_tools._handler._initialize()
-
-        orchestrator_history: List[Dict[str, Any]] = []
+        await self._set_agent_state(orchestrator="processing", programmer="idle", gui_operator="idle", grounding_model="idle")
     
         for i in range(10): # Max 10 steps
             print(f"\n--- Step {i+1} ---")
 
-            # Take current screenshot for orchestrator context
-            print("📸 Taking current screenshot for orchestrator...")
-            try:
-                current_screenshot_b64 = await self.orchestrator_tools._handler.screenshot()
-                print("   ✅ Current screenshot taken")
+            # Background tasks of this step (screenshot capture and broadcasts) are
+            # scoped to it: leaving the step, normally or through an error, waits
+            # for or cancels them rather than leaving them running
+            async with asyncio.TaskGroup() as step_tasks:
+                screenshot_broadcast = None
+                if (orchestrator_history and orchestrator_history[-1].get("type") == "function_call_output"
+                        and self._latest_screenshot is not None):
+                    # The sub-agent result already carries the resulting screen and asks the
+                    # orchestrator to evaluate it and pick the next action, so that one turn
+                    # covers both instead of following it with another prompt and screenshot
+                    print("📸 Reusing the sub-agent result screenshot for orchestrator...")
+                    screenshot_broadcast = step_tasks.create_task(
+                        self.broadcast_screenshot(self._latest_screenshot.png, "current")
+                    )
+                else:
+                    # Take current screenshot for orchestrator context
+                    print("📸 Taking current screenshot for orchestrator...")
+                    try:
+                        if first_screenshot_task is not None:
+                            screenshot_task, first_screenshot_task = first_screenshot_task, None
+                            current_screenshot = await screenshot_task
+                        else:
+                            current_screenshot = await self._take_screenshot()
+                        print("   ✅ Current screenshot taken")
+
+                        # Broadcast current screenshot to UI while the orchestrator plans
+                        screenshot_broadcast = step_tasks.create_task(self.broadcast_screenshot(current_screenshot.png, "current"))
+
+                        orchestrator_history.append({
+                            "role": "user",
+                            "content": [
+                                {"type": "text", "text": f"{task}\n"},
+                                NEXT_SUBTASK_PART,
+                                image_part(current_screenshot.llm_url)
+                            ]
+                        })
+                    except Exception as e:
+                        print(f"   ⚠️ Failed to take screenshot: {e}")
+                        orchestrator_history.append({
+                            "role": "user",
+                            "content": NEXT_SUBTASK_PROMPT
+                        })
+
+                # 2. Call Orchestrator
+                print("🤔 Orchestrator is planning...")
+                delegation = None
+                orchestrator_run = self.orchestrator.run(orchestrator_history)
+                try:
+                    async for result in orchestrator_run:
+                        delegation = next(
+                            (item for item in result.get("output", []) if item.get("type") == "function_call"), None
+                        )
+                        if delegation:
+                            break
+                finally:
+                    # Stop the agent loop now rather than leaving it suspended until
+                    # garbage collection; resuming it would execute the placeholder
+                    # delegate tool and could start another LLM turn
+                    await orchestrator_run.aclose()
 
-                # Broadcast current screenshot to UI
-                await self.broadcast_screenshot(current_screenshot_b64, "current")
+                if screenshot_broadcast is not None:
+                    await screenshot_broadcast
 
-                orchestrator_history.append({
-                    "role": "user",
-                    "content": [
-                        {"type": "text", "text": f"{task}\n"},
-                        {"type": "text", "text": "What is the next subtask based on the current progress? (or you can call task_completed)"},
-                        {"type": "image_url", "image_url": {"url": f"data:image/png;base64,{current_screenshot_b64}"}}
-                    ]
-                })
-            except Exception as e:
-                print(f"   ⚠️ Failed to take screenshot: {e}")
-                orchestrator_history.append({
-                    "role": "user",
-                    "content": "What is the next subtask based on the current progress? (or you can call task_completed)"
-                })
+                if not delegation:
+                    print("🛑 Orchestrator did not delegate a task. Ending.")
+                    break
 
-            # 2. Call Orchestrator
-            print("🤔 Orchestrator is planning...")
-            delegation = None
-            async for result in self.orchestrator.run(orchestrator_history):
-                for item in result.get("output", []):
-                    if item.get("type") == "function_call":
-                        delegation = item
-                        break
-                if delegation:
+                # Handle both direct format and nested function format
+                function_info = delegation.get("function", delegation)
+                tool_name = function_info.get("name")
+                arguments = function_info.get("arguments", {})
+                if isinstance(arguments, str):
+                    arguments = orjson.loads(arguments)
+                subtask = arguments.get("subtask", "")
+
+                if not delegation.get("call_id"):
+                    # Give the delegation an ID its function_call_output can refer to
+                    delegation["call_id"] = f"call_{next(self._call_id_counter)}"
+
+                orchestrator_history.append(delegation) # Add delegation to history
+
+                if tool_name == "task_completed":
+                    print("✅ Task completed!")
+                    # Set all agents to idle
+                    await self._set_agent_state(orchestrator="idle", programmer="idle", gui_operator="idle", grounding_model="idle")
+                    # Broadcast task completion event
+                    await self.broadcast_event("task_completed", {
+                        "task": task,
+                        "step": i + 1
+                    })
                     break
-            
-            if not delegation:
-                print("🛑 Orchestrator did not delegate a task. Ending.")
-                break
-
-            # Handle both direct format and nested function format
-            function_info = delegation.get("function", delegation)
-            tool_name = function_info.get("name")
-            arguments = function_info.get("arguments", {})
-            if isinstance(arguments, str):
-                arguments = json.loads(arguments)
-            subtask = arguments.get("subtask", "")
-
-            orchestrator_history.append(delegation) # Add delegation to history
-
-            if tool_name == "task_completed":
-                print("✅ Task completed!")
-                # Set all agents to idle
-                await self.broadcast_event("agent_state", {
-                    "orchestrator": "idle",
-                    "programmer": "idle",
-                    "gui_operator": "idle",
-                    "grounding_model": "idle"
-                })
-                # Broadcast task completion event
-                await self.broadcast_event("task_completed", {
-                    "task": task,
-                    "step": i + 1
-                })
-                break
-
-            sub_agent = None
-            target_agent = ""
-            if tool_name == "delegate_to_programmer":
-                print(f"👨‍💻 Delegating to Programmer: {subtask}")
-                sub_agent = self.programmer
-                target_agent = "Programmer"
-                # Set programmer as processing, others idle
-                await self.broadcast_event("agent_state", {
-                    "orchestrator": "idle",
-                    "programmer": "processing",
-                    "gui_operator": "idle",
-                    "grounding_model": "idle"
-                })
-            elif tool_name == "delegate_to_gui_operator":
-                print(f"🖱️ Delegating to GUI Operator: {subtask}")
-                sub_agent = self.gui_operator
-                target_agent = "GUIOperator"
-                # Set GUI operator as processing, others idle
-                await self.broadcast_event("agent_state", {
-                    "orchestrator": "idle",
-                    "programmer": "idle",
-                    "gui_operator": "processing",
-                    "grounding_model": "idle"
-                })
-            else:
-                print(f"❓ Unknown delegation: {tool_name}")
-                continue
 
-            # Broadcast task delegation event with the actual message sent to agent
-            delegation_message = f"{target_agent}: {subtask}"
-            print(f"🔄 Broadcasting task_delegated: {delegation_message} (step {i+1})")
-
-            await self.broadcast_event("task_delegated", {
-                "task_id": f"sub-{i+1}",
-                "description": delegation_message,
-                "assigned_to": target_agent,
-                "parent_task": task,
-                "step": i + 1
-            })
-            
-        
-            # Include the image directly in the subtask message
-            sub_agent_history = [{
-                "role": "user",
-                "content": [
-                    {"type": "text", "text": f"{subtask}\n\nHere is the current screen state:"},
-                    {"type": "image_url", "image_url": {"url": f"data:image/png;base64,{current_screenshot_b64}"}}
+                # Resolve the delegation into (agent name, sub-agent, subtask) assignments
+                rejection = None
+                if tool_name == "delegate_to_programmer":
+                    assignments = [("Programmer", self.programmer, subtask)]
+                elif tool_name == "delegate_to_gui_operator":
+                    assignments = [("GUIOperator", self.gui_operator, subtask)]
+                elif tool_name == "delegate_in_parallel":
+                    assignments = [
+                        ("Programmer", self.programmer, arguments.get("programmer_subtask", "")),
+                        ("GUIOperator", self.gui_operator, arguments.get("gui_operator_subtask", ""))
+                    ]
+                else:
+                    print(f"❓ Unknown delegation: {tool_name}")
+                    rejection = f"Unknown function '{tool_name}'. Use delegate_to_programmer, delegate_to_gui_operator, delegate_in_parallel or task_completed."
+
+                if rejection is None and any(not str(agent_subtask).strip() for _, _, agent_subtask in assignments):
+                    # A sub-agent given nothing to do would still spend a whole run on the VM
+                    print(f"❓ Empty subtask in {tool_name}")
+                    rejection = (
+                        f"'{tool_name}' was called with an empty subtask. Give every delegated agent a concrete "
+                        "subtask; use delegate_to_programmer or delegate_to_gui_operator when only one agent has work."
+                    )
+
+                if rejection is not None:
+                    # Answer the call so the history stays well-formed; the screen is
+                    # unchanged, so the next step reuses the screenshot already taken
+                    orchestrator_history.append({
+                        "type": "function_call_output",
+                        "call_id": delegation["call_id"],
+                        "output": rejection,
+                    })
+                    continue
+
+                for target_agent, _, agent_subtask in assignments:
+                    if target_agent == "Programmer":
+                        print(f"👨‍💻 Delegating to Programmer: {agent_subtask}")
+                    else:
+                        print(f"🖱️ Delegating to GUI Operator: {agent_subtask}")
+
+                # Set the delegated sub-agents as processing, others idle
+                delegated_agents = {target_agent for target_agent, _, _ in assignments}
+                await self._set_agent_state(
+                    orchestrator="idle",
+                    programmer="processing" if "Programmer" in delegated_agents else "idle",
+                    gui_operator="processing" if "GUIOperator" in delegated_agents else "idle",
+                    grounding_model="idle"
+                )
+
+                # Parallel subtasks get their own task IDs so the UI can track each one
+                task_ids = [f"sub-{i+1}"] if len(assignments) == 1 else [f"sub-{i+1}-{n+1}" for n in range(len(assignments))]
+
+                for task_id, (target_agent, _, agent_subtask) in zip(task_ids, assignments):
+                    # Broadcast task delegation event with the actual message sent to agent
+                    delegation_message = f"{target_agent}: {agent_subtask}"
+                    print(f"🔄 Broadcasting task_delegated: {delegation_message} (step {i+1})")
+
+                    await self.broadcast_event("task_delegated", {
+                        "task_id": task_id,
+                        "description": delegation_message,
+                        "assigned_to": target_agent,
+                        "parent_task": task,
+                        "step": i + 1
+                    })
+
+                # Include the image directly in the subtask message. If this step's
+                # screenshot failed, fall back to the latest one that succeeded.
+                latest_screenshot = self._latest_screenshot
+                screenshot_url = latest_screenshot.png_url if latest_screenshot is not None else None
+                screenshot_inputs = {name: (screenshot_url, SCREEN_STATE_CAPTION) for name in delegated_agents}
+
+                # The Programmer only needs the screen for context, so it gets just the
+                # region that changed since the previous delegation when that region is
+                # small. The GUI Operator always gets the full frame: its OCR and
+                # grounding coordinates are taken from this screenshot.
+                if ("Programmer" in delegated_agents and previous_screenshot is not None
+                        and latest_screenshot is not None and latest_screenshot is not previous_screenshot):
+                    crop = await asyncio.to_thread(crop_to_changed_region, previous_screenshot.png, latest_screenshot.png)
+                    if crop is not None:
+                        crop_url, (left, top, right, bottom) = crop
+                        screenshot_inputs["Programmer"] = (
+                            crop_url,
+                            f"Here is the part of the screen that changed since the previous subtask "
+                            f"(pixels {left},{top} to {right},{bottom}; the rest is unchanged):"
+                        )
+                        print(f"   ✂️ Cropped Programmer screenshot to changed region ({left},{top})-({right},{bottom})")
+                previous_screenshot = latest_screenshot
+
+                # Independent subtasks run concurrently; the computer interface
+                # serialises the individual commands they send to the VM. If one
+                # sub-agent fails, the task group cancels the other
+                sub_agent_runs = [
+                    step_tasks.create_task(self._run_sub_agent(sub_agent, agent_subtask, *screenshot_inputs[target_agent]))
+                    for target_agent, sub_agent, agent_subtask in assignments
+                ]
+                final_messages = [await sub_agent_run for sub_agent_run in sub_agent_runs]
+
+                # Capture the resulting screen while the completion bookkeeping runs
+                final_screenshot_task = step_tasks.create_task(self._take_screenshot())
+
+                # Set orchestrator back to processing for next iteration
+                await self._set_agent_state(orchestrator="processing", programmer="idle", gui_operator="idle", grounding_model="idle")
+
+                for task_id, (target_agent, _, agent_subtask), final_message in zip(task_ids, assignments, final_messages):
+                    # Broadcast sub-agent completion event
+                    await self.broadcast_event("subtask_completed", {
+                        "task_id": task_id,
+                        "description": agent_subtask,
+                        "assigned_to": target_agent,
+                        "result": final_message,
+                        "step": i + 1
+                    })
+
+                final_screenshot = await final_screenshot_task
+
+                # Broadcast final screenshot as previous screenshot for next iteration
+                await self.broadcast_screenshot(final_screenshot.png, "previous")
+
+                # Create a message with the sub-agent's final message and the current screenshot for orchestrator evaluation
+                if final_screenshot is latest_screenshot:
+                    # Screenshots are content-addressed, so the same entry means the screen
+                    # is pixel-identical to the one the orchestrator already has; say so
+                    # instead of sending the image again
+                    print("   🟰 Screen unchanged by the sub-agent")
+                    screen_state = SCREEN_UNCHANGED_TEXT
+                else:
+                    screen_state = SCREEN_STATE_TEXT
+                if len(assignments) == 1:
+                    completion = f"Sub-agent completed task.\n\nFinal Message: {final_messages[0]}"
+                else:
+                    completion = "Sub-agents completed their tasks.\n\n" + "\n\n".join(
+                        f"{target_agent} Final Message: {final_message}"
+                        for (target_agent, _, _), final_message in zip(assignments, final_messages)
+                    )
+                orchestrator_result_content = [
+                    {"type": "text", "text": f"{completion}\n\n{screen_state} {EVALUATE_PROMPT}"}
                 ]
-            }]
-            print("   🖼️ Provided image context to sub-agent")
-           
-
-            async for result in sub_agent.run(sub_agent_history):
-                sub_agent_history.extend(result.get("output", []))
-
-            final_screenshot_b64 = await self.orchestrator_tools._handler.screenshot()
-
-            # Broadcast final screenshot as previous screenshot for next iteration
-            await self.broadcast_screenshot(final_screenshot_b64, "previous")
-
-            # 5. Extract the sub-agent's final completion message
-            print("📝 Extracting sub-agent completion message...")
-            final_message = self._extract_sub_agent_final_message(sub_agent_history)
-            print(f"Final message: {final_message}")
-
-            # Set orchestrator back to processing for next iteration
-            await self.broadcast_event("agent_state", {
-                "orchestrator": "processing",
-                "programmer": "idle",
-                "gui_operator": "idle",
-                "grounding_model": "idle"
-            })
-
-            # Broadcast sub-agent completion event
-            await self.broadcast_event("subtask_completed", {
-                "task_id": f"sub-{i+1}",
-                "description": subtask,
-                "assigned_to": target_agent,
-                "result": final_message,
-                "step": i + 1
-            })
-
-            # Create a message with the sub-agent's final message and the current screenshot for orchestrator evaluation
-            orchestrator_result_content = [
-                {"type": "text", "text": f"Sub-agent completed task.\n\nFinal Message: {final_message}\n\nHere is the current screen state. Evaluate whether the sub-task was successful and determine the next action."}
-            ]
-
-            if final_screenshot_b64:
-                orchestrator_result_content.append({
-                    "type": "image_url",
-                    "image_url": {"url": f"data:image/png;base64,{final_screenshot_b64}"}
-                })
 
-            orchestrator_history.append({
-                "type": "function_call_output",
-                "call_id": delegation.get("call_id", f"call_{hash(str(delegation))}"),
-                "output": orchestrator_result_content,
-            })
\ No newline at end of file
+                if final_screenshot.png and final_screenshot is not latest_screenshot:
+                    orchestrator_result_content.append(image_part(final_screenshot.llm_url))
+
+                orchestrator_history.append({
+                    "type": "function_call_output",
+                    "call_id": delegation["call_id"],
+                    "output": orchestrator_result_content,
+                })
+                orchestrator_history = self._compact_orchestrator_history(task, orchestrator_history)
\ No newline at end of file
@@ -705,8 +705,10 @@ class GenericComputerInterface(BaseComputerInterface):
                     raise ConnectionError("WebSocket connection is not established")
 
                 message = {"command": command, "params": params or {}}
-                await self._ws.send(json.dumps(message))
+                # Hold the lock across send and recv so concurrent callers
+                # (e.g. parallel sub-agents) can't read each other's responses
                 async with self._recv_lock:
+                    await self._ws.send(json.dumps(message))
                     response = await asyncio.wait_for(self._ws.recv(), timeout=120)
                 self.logger.debug(f"Completed command: {command}")
                 return json.loads(response)
@@ -79,6 +79,7 @@ async def main():
                 await coact_system.stop_websocket_server()
             except Exception as e:
                 print(f"⚠️ Error stopping WebSocket server: {e}")
+            coact_system.shutdown_ocr_workers()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,22 @@
+"""
+Model capability checks for CoAct-1 Multi-Agent System
+
+Capabilities are detected from the litellm model name prefix, which names the
+provider route the request actually goes through.
+"""
+
+# Model name prefixes whose vision APIs accept WebP images
+WEBP_MODEL_PREFIXES = ("gemini/", "vertex_ai/", "anthropic/", "claude-", "openai/", "gpt-")
+
+# Model name prefixes routed to Anthropic's API, which honours cache_control
+PROMPT_CACHING_MODEL_PREFIXES = ("anthropic/", "claude-")
+
+
+def supports_webp(model: str) -> bool:
+    """Whether screenshots for this model can be sent as WebP instead of PNG."""
+    return model.lower().startswith(WEBP_MODEL_PREFIXES)
+
+
+def supports_prompt_caching(model: str) -> bool:
+    """Whether prompt prefixes for this model can be marked for caching."""
+    return model.lower().startswith(PROMPT_CACHING_MODEL_PREFIXES)
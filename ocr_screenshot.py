@@ -7,44 +7,132 @@ returning UI elements in the same format as the original codebase.
 It also saves a debug image with OCR bounding boxes overlaid.
 
 Requirements:
-- pip install rapidocr pillow pyautogui screeninfo
+- pip install rapidocr pillow numpy mss
 
 Usage:
-    python ocr_screenshot.py
+    python ocr_screenshot.py [--repeat N] [--all-monitors]
 """
 
-import io
-import pyautogui
-import screeninfo
+import argparse
+import functools
+import hashlib
+import os
+import platform
+import queue
+import threading
+import numpy as np
+from mss import mss
 from PIL import Image, ImageDraw, ImageFont
-from typing import Tuple, List, Dict, Any
+from typing import Tuple, List, Dict, Any, Optional, Union
 
+# INT8-quantized PP-OCR detection/recognition models for get_rapid_ocr_engine(quantized=True)
+QUANTIZED_MODEL_DIR = os.environ.get("RAPIDOCR_INT8_MODEL_DIR", os.path.join("models", "rapidocr_int8"))
+QUANTIZED_MODEL_FILES = {
+    "Det": "ch_PP-OCRv4_det_infer_int8.onnx",
+    "Rec": "ch_PP-OCRv4_rec_infer_int8.onnx",
+}
 
-def get_rapid_ocr_engine(device: str = "cpu"):
+
+def _is_intel_cpu() -> bool:
+    """Whether the CPU vendor is Intel, the only CPUs OpenVINO is reliably faster on."""
+    if platform.system() == "Linux":
+        try:
+            with open("/proc/cpuinfo", encoding="utf-8") as cpuinfo:
+                for line in cpuinfo:
+                    if line.startswith("vendor_id"):
+                        return "GenuineIntel" in line
+        except OSError:
+            return False
+        return False
+    # Windows reports e.g. "Intel64 Family 6 Model 154 Stepping 3, GenuineIntel"
+    return "intel" in platform.processor().lower()
+
+
+def detect_ocr_device() -> str:
+    """
+    Pick the fastest OCR backend available on this machine.
+
+    Returns:
+        "cuda", "dml" or "cann" if onnxruntime exposes the matching execution
+        provider, "openvino" on Intel CPUs with OpenVINO installed, else "cpu"
+    """
+    try:
+        import onnxruntime
+        providers = set(onnxruntime.get_available_providers())
+    except ImportError:
+        providers = set()
+
+    if "CUDAExecutionProvider" in providers:
+        return "cuda"
+    if "DmlExecutionProvider" in providers and platform.system() == "Windows":
+        return "dml"
+    if "CANNExecutionProvider" in providers:
+        return "cann"
+    if _is_intel_cpu():
+        try:
+            import openvino  # noqa: F401
+            return "openvino"
+        except ImportError:
+            pass
+    return "cpu"
+
+
+@functools.lru_cache(maxsize=2)
+def get_rapid_ocr_engine(device: str = "cpu", quantized: bool = False):
     """
     Initialize RapidOCR engine.
 
+    The engine is cached per device, so repeated calls reuse the already
+    built ONNX sessions instead of loading the models again.
+
     Args:
-        device: Device to use ("cpu" or "cuda")
+        device: Device to use: "cpu", "cuda", "dml" (DirectML on Windows),
+            "cann" (Huawei Ascend), "openvino" (Intel CPU/iGPU) or "auto" to
+            pick one with detect_ocr_device()
+        quantized: On the plain CPU backend, use INT8 models (about twice as
+            fast on CPUs with VNNI) from QUANTIZED_MODEL_DIR; falls back to the
+            default FP32 models if they are missing. RapidOCR doesn't ship
+            them: quantize its PP-OCRv4 det/rec ONNX models, e.g. with
+            onnxruntime.quantization.quantize_dynamic, and save them under
+            the names in QUANTIZED_MODEL_FILES
 
     Returns:
         RapidOCR engine instance
     """
+    if device == "auto":
+        device = detect_ocr_device()
+        print(f"⚙️ Using OCR device: {device}")
+
     params = {
         "EngineConfig.onnxruntime.use_cuda": device == "cuda",
+        "EngineConfig.onnxruntime.use_dml": device == "dml",
+        "EngineConfig.onnxruntime.use_cann": device == "cann",
     }
     from rapidocr import RapidOCR
+    if device == "openvino":
+        from rapidocr import EngineType
+        for stage in ("Det", "Cls", "Rec"):
+            params[f"{stage}.engine_type"] = EngineType.OPENVINO
+    if quantized and device == "cpu":
+        model_paths = {stage: os.path.join(QUANTIZED_MODEL_DIR, name) for stage, name in QUANTIZED_MODEL_FILES.items()}
+        if all(os.path.isfile(path) for path in model_paths.values()):
+            for stage, path in model_paths.items():
+                params[f"{stage}.model_path"] = path
+        else:
+            print(f"⚠️ INT8 OCR models not found in {QUANTIZED_MODEL_DIR}, using FP32 models")
     engine = RapidOCR(params=params)
     return engine
 
 
-def check_ocr_result(result, text_threshold=0.9):
+def check_ocr_result(result, text_threshold=0.9, scale=1.0):
     """
     Process OCR results from RapidOCR.
 
     Args:
         result: OCR result from RapidOCR
         text_threshold: Minimum confidence score for text detection
+        scale: Factor the image was resized by before OCR; boxes are mapped
+            back to original image coordinates by dividing by it
 
     Returns:
         Tuple of (text_list, bbox_list) where bbox is (x1, y1, x2, y2)
@@ -52,59 +140,101 @@ def check_ocr_result(result, text_threshold=0.9):
     if result is None:
         return [], []
 
-    text = []
-    bb = []
+    if getattr(result, 'txts', None) is None or len(result.txts) == 0:
+        return [], []
+
+    # Reduce every (4, 2) quadrilateral to its axis-aligned bounds at once
+    mask = np.asarray(result.scores) > text_threshold
+    boxes = np.asarray(result.boxes, dtype=np.float32)[mask]
+    if scale != 1.0:
+        boxes /= scale
+    bb = np.concatenate([boxes.min(axis=1), boxes.max(axis=1)], axis=1).astype(np.int32)
+    text = [txt for txt, keep in zip(result.txts, mask) if keep]
+
+    return text, [tuple(box) for box in bb.tolist()]
+
+
+@functools.lru_cache(maxsize=1)
+def _get_debug_font(size: int = 16):
+    """
+    Load the font used for OCR debug labels, once per process.
+
+    Args:
+        size: Font size in pixels
 
-    if hasattr(result, 'txts') and result.txts is not None:
-        for txt, score, box in zip(result.txts, result.scores, result.boxes):
-            if score > text_threshold:
-                text.append(txt)
+    Returns:
+        DejaVu Sans or Arial if available, otherwise PIL's default font
+    """
+    try:
+        return ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", size)
+    except OSError:
+        try:
+            return ImageFont.truetype("arial.ttf", size)
+        except OSError:
+            return ImageFont.load_default()
 
-                x_coords = [p[0] for p in box]
-                y_coords = [p[1] for p in box]
-                x1 = int(min(x_coords))
-                y1 = int(min(y_coords))
-                x2 = int(max(x_coords))
-                y2 = int(max(y_coords))
 
-                bb.append((x1, y1, x2, y2))
+@functools.lru_cache(maxsize=4)
+def _get_label_metrics(font) -> Tuple[Dict[str, float], Tuple[int, int]]:
+    """
+    Measure a debug font once for cheap label sizing.
 
-    return text, bb
+    Args:
+        font: PIL font used for the labels
 
+    Returns:
+        Tuple of (advance width per printable ASCII character, (top, bottom)
+        offsets of a line relative to the text origin)
+    """
+    advances = {chr(c): font.getlength(chr(c)) for c in range(32, 127)}
+    _, top, _, bottom = font.getbbox("Agjy|")
+    return advances, (top, bottom)
 
-def draw_ocr_debug_image(image: Image.Image, text_list: List[str], bbox_list: List[Tuple[int, int, int, int]], output_path: str = "ocr_debug.png"):
+
+def draw_ocr_debug_image(image: Union[Image.Image, np.ndarray], text_list: List[str], bbox_list: List[Tuple[int, int, int, int]], output_path: str = "ocr_debug.png"):
     """
     Draw OCR bounding boxes and text on the image and save as debug image.
 
     Args:
-        image: PIL Image to draw on
+        image: PIL Image, or an HxWx3 RGB uint8 array, to draw on. Arrays are
+            drawn on in place, so callers can hand over a buffer they no
+            longer need instead of paying for a copy
         text_list: List of detected text strings
         bbox_list: List of bounding boxes (x1, y1, x2, y2)
         output_path: Path to save the debug image
     """
     try:
-        # Create a copy of the image to draw on
-        debug_image = image.copy()
+        # Stamp the 2px box outlines straight into a pixel array; only the text
+        # labels go through ImageDraw
+        pixels = image if isinstance(image, np.ndarray) else np.array(image if image.mode == "RGB" else image.convert("RGB"))
+        height, width = pixels.shape[:2]
+        red = np.array((255, 0, 0), dtype=np.uint8)
+        for x1, y1, x2, y2 in bbox_list:
+            x1, x2 = max(x1, 0), min(x2 + 1, width)
+            y1, y2 = max(y1, 0), min(y2 + 1, height)
+            if x1 >= x2 or y1 >= y2:
+                continue
+            pixels[y1:y1 + 2, x1:x2] = red
+            pixels[max(y2 - 2, y1):y2, x1:x2] = red
+            pixels[y1:y2, x1:x1 + 2] = red
+            pixels[y1:y2, max(x2 - 2, x1):x2] = red
+        debug_image = Image.fromarray(pixels)
         draw = ImageDraw.Draw(debug_image)
 
-        # Try to use a better font, fallback to default if not available
-        try:
-            font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 16)
-        except:
-            try:
-                font = ImageFont.truetype("arial.ttf", 16)
-            except:
-                font = ImageFont.load_default()
-
-        # Draw bounding boxes and text
-        for text, bbox in zip(text_list, bbox_list):
-            x1, y1, x2, y2 = bbox
+        font = _get_debug_font()
+        advances, (line_top, line_bottom) = _get_label_metrics(font)
 
-            # Draw bounding box
-            draw.rectangle([x1, y1, x2, y2], outline="red", width=2)
-
-            # Draw text background for readability
-            text_bbox = draw.textbbox((x1, y1-20), text, font=font)
+        # Draw text labels above the boxes
+        for text, bbox in zip(text_list, bbox_list):
+            x1, y1 = bbox[0], bbox[1]
+
+            # Draw text background for readability, sized from the cached glyph
+            # advances; only text with other characters is measured by FreeType
+            if all(c in advances for c in text):
+                width = sum(advances[c] for c in text)
+                text_bbox = (x1, y1 - 20 + line_top, x1 + width, y1 - 20 + line_bottom)
+            else:
+                text_bbox = draw.textbbox((x1, y1-20), text, font=font)
             draw.rectangle(text_bbox, fill="white")
 
             # Draw text
@@ -118,26 +248,40 @@ def draw_ocr_debug_image(image: Image.Image, text_list: List[str], bbox_list: Li
         print(f"⚠️ Failed to create OCR debug image: {e}")
 
 
+@functools.lru_cache(maxsize=1)
+def _get_screen_grabber():
+    """Create the mss grabber once; it keeps its native display handles open between captures."""
+    return mss()
+
+
+def _grab_primary_monitor(sct) -> Tuple[Image.Image, Dict]:
+    """Grab the primary monitor (or the whole screen if mss lists none) with an mss instance."""
+    # monitors[0] spans every screen; the individual monitors follow it
+    monitor = sct.monitors[1] if len(sct.monitors) > 1 else sct.monitors[0]
+    shot = sct.grab(monitor)
+    screenshot = Image.frombytes('RGB', shot.size, shot.rgb)
+    monitor_info = {'x': monitor['left'], 'y': monitor['top'], 'width': shot.width, 'height': shot.height}
+    return screenshot, monitor_info
+
+
 def capture_screen() -> Tuple[Image.Image | None, Dict | None]:
     """
     Captures the primary monitor's screen.
 
+    Uses mss, which reads the framebuffer through the platform's capture API
+    (XShm, CoreGraphics, GDI) instead of spawning a screenshot tool.
+
     Returns:
         A tuple containing:
         - A PIL Image object of the screen capture, or None on error.
         - A dictionary with monitor details ('x', 'y', 'width', 'height'), or None on error.
     """
     try:
-        monitors = screeninfo.get_monitors()
-        if not monitors:
-            print("⚠️ No monitors detected by screeninfo, capturing full screen.")
-            screenshot = pyautogui.screenshot()
-            monitor_info = {'x': 0, 'y': 0, 'width': screenshot.width, 'height': screenshot.height}
-        else:
-            monitor = monitors[0]
-            print(f"📸 Capturing screen of monitor {monitor.width}x{monitor.height} at ({monitor.x}, {monitor.y})")
-            screenshot = pyautogui.screenshot(region=(monitor.x, monitor.y, monitor.width, monitor.height))
-            monitor_info = {'x': monitor.x, 'y': monitor.y, 'width': monitor.width, 'height': monitor.height}
+        sct = _get_screen_grabber()
+        if len(sct.monitors) < 2:
+            print("⚠️ No individual monitors detected by mss, capturing full screen.")
+        screenshot, monitor_info = _grab_primary_monitor(sct)
+        print(f"📸 Captured screen of monitor {monitor_info['width']}x{monitor_info['height']} at ({monitor_info['x']}, {monitor_info['y']})")
 
         return screenshot, monitor_info
     except Exception as e:
@@ -145,14 +289,108 @@ def capture_screen() -> Tuple[Image.Image | None, Dict | None]:
         return None, None
 
 
-def analyze_screen_ocr_only(image: Image.Image, monitor_info: Dict, rapid_ocr_engine) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+class FrameProducer:
+    """
+    Captures the primary monitor on a background thread, one frame ahead.
+
+    Each latest() call hands out the frame captured in advance and asks the
+    thread for the next one, so that capture overlaps with the caller's OCR of
+    the current frame. Between requests the thread sleeps rather than capture
+    in a loop, leaving the CPU to the OCR inference.
+
+    Usage:
+        with FrameProducer() as producer:
+            while ...:
+                image, monitor_info = producer.latest()
+                nodes, edges = analyze_screen_ocr_only(image, monitor_info, engine)
+    """
+
+    def __init__(self):
+        self._frames: "queue.Queue[Tuple[Image.Image | None, Dict | None]]" = queue.Queue(maxsize=1)
+        self._wanted = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "FrameProducer":
+        """Start the capture thread and have it grab the first frame."""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="FrameProducer", daemon=True)
+            self._thread.start()
+            self._wanted.set()
+        return self
+
+    def stop(self):
+        """Stop the capture thread and wait for it to exit."""
+        self._stop.set()
+        self._wanted.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "FrameProducer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _run(self):
+        # mss holds thread-bound native handles, so the thread owns its own instance
+        with mss() as sct:
+            while True:
+                self._wanted.wait()
+                if self._stop.is_set():
+                    return
+                self._wanted.clear()
+                try:
+                    frame = _grab_primary_monitor(sct)
+                except Exception as e:
+                    print(f"🔴 Error capturing screen: {e}")
+                    frame = (None, None)
+                self._frames.put(frame)
+
+    def latest(self, timeout: Optional[float] = 5.0, prefetch: bool = True) -> Tuple[Image.Image | None, Dict | None]:
+        """
+        Return the frame captured in advance and start capturing the next one.
+
+        Args:
+            timeout: Seconds to wait if the frame is still being captured
+            prefetch: Capture the next frame in the background (pass False for
+                the last frame a caller needs)
+
+        Returns:
+            Tuple of (PIL Image, monitor details), or (None, None) on error or timeout
+        """
+        try:
+            frame = self._frames.get(timeout=timeout)
+        except queue.Empty:
+            return None, None
+        if prefetch:
+            self._wanted.set()
+        return frame
+
+
+# Per monitor origin: key and nodes of the last screenshot analyzed there, so an
+# unchanged screen is not OCR'd again (also when several monitors take turns)
+_last_ocr_results: Dict[Tuple[int, int], Tuple[Any, List[Dict[str, Any]]]] = {}
+
+
+def analyze_screen_ocr_only(image: Image.Image, monitor_info: Dict, rapid_ocr_engine=None,
+                            max_edge: Optional[int] = 1600,
+                            debug_image_path: Optional[str] = "ocr_debug.png") -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
     """
     Analyzes a screenshot with OCR only to identify text elements.
 
     Args:
         image: The raw PIL Image of the screen.
         monitor_info: A dictionary with the screen's geometry.
-        rapid_ocr_engine: The OCR engine instance.
+        rapid_ocr_engine: The OCR engine instance (defaults to the cached CPU
+            engine from get_rapid_ocr_engine).
+        max_edge: Screenshots whose longest side exceeds this are downscaled
+            before OCR and the boxes scaled back (None to disable). The
+            detector rescales its input anyway, so this mainly saves work;
+            very small text on large screens may be missed more often.
+        debug_image_path: Where to save the OCR debug image (None to skip it).
 
     Returns:
         A tuple containing:
@@ -162,49 +400,72 @@ def analyze_screen_ocr_only(image: Image.Image, monitor_info: Dict, rapid_ocr_en
     print("🔍 Analyzing screen with OCR only...")
 
     try:
-        # Convert image to RGB and prepare for OCR
-        image_rgb = image.convert('RGB')
-        buffer = io.BytesIO()
-        image_rgb.save(buffer, format='PNG')
-        image_rgb_bytes = buffer.getvalue()
+        if rapid_ocr_engine is None:
+            rapid_ocr_engine = get_rapid_ocr_engine()
+
+        # Hashing the pixels costs a few milliseconds against hundreds for OCR.
+        # An exact digest is used rather than a perceptual hash, which could
+        # miss a small text change and return stale results
+        monitor_origin = (monitor_info['x'], monitor_info['y'])
+        ocr_key = (
+            hashlib.blake2b(image.tobytes(), digest_size=16).digest(),
+            image.mode, image.size, id(rapid_ocr_engine), max_edge
+        )
+        last_key, last_nodes = _last_ocr_results.get(monitor_origin, (None, []))
+        if ocr_key == last_key:
+            print(f"✅ Screen unchanged, reusing {len(last_nodes)} text elements.")
+            return [dict(node) for node in last_nodes], []
+
+        # Hand RapidOCR the pixels directly rather than a PNG it would decode
+        # again; ndarray input is taken as OpenCV's BGR channel order. The
+        # full-resolution RGB array is converted once and reused by the debug render
+        image_rgb = image if image.mode == 'RGB' else image.convert('RGB')
+        pixels = np.array(image_rgb)
+        scale = min(1.0, max_edge / max(image_rgb.size)) if max_edge else 1.0
+        if scale < 1.0:
+            ocr_pixels = np.asarray(image_rgb.resize(
+                (max(1, int(image_rgb.width * scale)), max(1, int(image_rgb.height * scale))),
+                Image.BILINEAR,
+            ))
+        else:
+            ocr_pixels = pixels
+        image_bgr = np.ascontiguousarray(ocr_pixels[..., ::-1])
 
         # Perform OCR
         if rapid_ocr_engine:
-            result = rapid_ocr_engine(image_rgb_bytes)
-            text_list, ocr_bbox = check_ocr_result(result)
+            result = rapid_ocr_engine(image_bgr)
+            text_list, ocr_bbox = check_ocr_result(result, scale=scale)
         else:
             text_list, ocr_bbox = [], []
 
         # Create OCR debug image
-        if text_list and ocr_bbox:
-            draw_ocr_debug_image(image, text_list, ocr_bbox, "ocr_debug.png")
-
-        # Convert OCR results to node format
-        nodes = []
-        for i, (content, bbox) in enumerate(zip(text_list, ocr_bbox)):
-            x1, y1, x2, y2 = bbox
-
-            # Convert to absolute screen coordinates
-            abs_x1 = x1 + monitor_info['x']
-            abs_y1 = y1 + monitor_info['y']
-            abs_x2 = x2 + monitor_info['x']
-            abs_y2 = y2 + monitor_info['y']
-
-            new_node = {
+        if debug_image_path and text_list and ocr_bbox:
+            draw_ocr_debug_image(pixels, text_list, ocr_bbox, debug_image_path)
+
+        # Convert OCR results to node format: offset every box to absolute
+        # screen coordinates at once, as (x, y, width, height) rows
+        boxes = np.asarray(ocr_bbox, dtype=np.int32).reshape(-1, 4)
+        boxes[:, 2:] -= boxes[:, :2]
+        boxes[:, :2] += (monitor_info['x'], monitor_info['y'])
+        nodes = [
+            {
                 "id": i,
                 "content": content,
                 "type": "text",
                 "interactivity": False,  # OCR text is not interactive
-                "x": abs_x1,
-                "y": abs_y1,
-                "width": abs_x2 - abs_x1,
-                "height": abs_y2 - abs_y1
+                "x": x,
+                "y": y,
+                "width": width,
+                "height": height
             }
-            nodes.append(new_node)
+            for i, (content, (x, y, width, height)) in enumerate(zip(text_list, boxes.tolist()))
+        ]
 
         # Return empty edges list since we're not generating relationships
         edges = []
 
+        _last_ocr_results[monitor_origin] = (ocr_key, [dict(node) for node in nodes])
+
         print(f"✅ OCR analysis succeeded. Found {len(nodes)} text elements.")
         return nodes, edges
 
@@ -213,9 +474,78 @@ def analyze_screen_ocr_only(image: Image.Image, monitor_info: Dict, rapid_ocr_en
         return [], []
 
 
-def main():
+def capture_screens() -> List[Tuple[Image.Image, Dict]]:
+    """
+    Captures every monitor with a single grab of the virtual screen.
+
+    Returns:
+        A list of (PIL Image, monitor details) tuples, one per monitor, in
+        the same format as capture_screen(); empty on error.
+    """
+    try:
+        sct = _get_screen_grabber()
+        everything = sct.monitors[0]
+        shot = sct.grab(everything)
+        desktop = Image.frombytes('RGB', shot.size, shot.rgb)
+
+        # Crop each monitor out of the one capture instead of grabbing them separately
+        screens = []
+        for monitor in sct.monitors[1:] or [everything]:
+            left = monitor['left'] - everything['left']
+            top = monitor['top'] - everything['top']
+            screenshot = desktop.crop((left, top, left + monitor['width'], top + monitor['height']))
+            monitor_info = {'x': monitor['left'], 'y': monitor['top'], 'width': monitor['width'], 'height': monitor['height']}
+            screens.append((screenshot, monitor_info))
+
+        print(f"📸 Captured {len(screens)} monitor(s)")
+        return screens
+    except Exception as e:
+        print(f"🔴 Error capturing screens: {e}")
+        return []
+
+
+def analyze_screens_ocr_batch(images: List[Image.Image], monitor_infos: List[Dict], rapid_ocr_engine=None,
+                              max_edge: Optional[int] = 1600,
+                              debug_image_prefix: Optional[str] = None) -> List[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]:
+    """
+    Analyzes the screenshots of several monitors with OCR.
+
+    RapidOCR has no multi-image batch API and the monitors rarely share a
+    resolution, so the screenshots are processed one after another through a
+    single shared engine. Node coordinates are absolute per monitor.
+
+    Args:
+        images: The PIL Images, one per monitor.
+        monitor_infos: The matching monitor geometries.
+        rapid_ocr_engine: The OCR engine instance (defaults to the cached CPU
+            engine from get_rapid_ocr_engine).
+        max_edge: Downscale limit passed to analyze_screen_ocr_only.
+        debug_image_prefix: If given, save each monitor's OCR debug image as
+            <prefix>_<index>.png.
+
+    Returns:
+        A list of (nodes, edges) tuples, one per monitor.
+    """
+    if rapid_ocr_engine is None:
+        rapid_ocr_engine = get_rapid_ocr_engine()
+
+    return [
+        analyze_screen_ocr_only(
+            image, monitor_info, rapid_ocr_engine, max_edge,
+            f"{debug_image_prefix}_{i}.png" if debug_image_prefix else None
+        )
+        for i, (image, monitor_info) in enumerate(zip(images, monitor_infos))
+    ]
+
+
+def main(repeat: int = 1, all_monitors: bool = False):
     """
     Main function to demonstrate OCR screenshot analysis.
+
+    Args:
+        repeat: Number of screenshots to capture and analyze in a row; the
+            next capture runs in the background while the current one is OCR'd
+        all_monitors: Analyze every monitor instead of only the primary one
     """
     print("🚀 Starting OCR Screenshot Analysis...")
 
@@ -228,16 +558,35 @@ def main():
         print(f"🔴 Failed to initialize OCR engine: {e}")
         return
 
-    # Capture screenshot
-    print("📸 Capturing screenshot...")
-    screenshot, monitor_info = capture_screen()
-
-    if not screenshot or not monitor_info:
-        print("🔴 Failed to capture screenshot.")
-        return
-
-    # Analyze with OCR only
-    nodes, edges = analyze_screen_ocr_only(screenshot, monitor_info, ocr_engine)
+    if all_monitors:
+        for run in range(repeat):
+            screens = capture_screens()
+            if not screens:
+                print("🔴 Failed to capture screenshots.")
+                return
+            images, monitor_infos = zip(*screens)
+            results = analyze_screens_ocr_batch(list(images), list(monitor_infos), ocr_engine,
+                                                debug_image_prefix="ocr_debug")
+
+        print(f"\n📊 Analysis Results:")
+        for i, ((nodes, edges), monitor_info) in enumerate(zip(results, monitor_infos)):
+            print(f"Monitor {i} ({monitor_info['width']}x{monitor_info['height']} at "
+                  f"({monitor_info['x']}, {monitor_info['y']})): {len(nodes)} text elements, "
+                  f"debug image 'ocr_debug_{i}.png'")
+        return [node for nodes, _ in results for node in nodes], []
+
+    with FrameProducer() as producer:
+        for run in range(repeat):
+            # Capture screenshot
+            print("📸 Capturing screenshot...")
+            screenshot, monitor_info = producer.latest(prefetch=run < repeat - 1)
+
+            if not screenshot or not monitor_info:
+                print("🔴 Failed to capture screenshot.")
+                return
+
+            # Analyze with OCR only
+            nodes, edges = analyze_screen_ocr_only(screenshot, monitor_info, ocr_engine)
 
     # Print results
     print(f"\n📊 Analysis Results:")
@@ -257,7 +606,14 @@ def main():
 
 
 if __name__ == "__main__":
-    result = main()
+    parser = argparse.ArgumentParser(description="Take screenshots and analyze them with OCR")
+    parser.add_argument("-n", "--repeat", type=int, default=1,
+                        help="Number of screenshots to capture and analyze in a row")
+    parser.add_argument("--all-monitors", action="store_true",
+                        help="Analyze every monitor instead of only the primary one")
+    args = parser.parse_args()
+
+    result = main(repeat=max(1, args.repeat), all_monitors=args.all_monitors)
     if result:
         nodes, edges = result
         print(f"\n✅ Script completed successfully with {len(nodes)} text elements detected.")
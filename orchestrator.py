@@ -11,6 +11,8 @@ import logging
 from typing import Dict, Any, Tuple
 from agent import ComputerAgent
 from agent.computers.cua import cuaComputerHandler
+from agent_prompts import load_prompt
+from model_support import supports_prompt_caching
 
 
 class OrchestratorTools:
@@ -48,6 +50,11 @@ def delegate_to_gui_operator(subtask: str):
     pass
 
 
+def delegate_in_parallel(programmer_subtask: str, gui_operator_subtask: str):
+    """Delegates two independent subtasks at once, one to the programmer and one to the GUI operator, which run concurrently."""
+    pass
+
+
 def task_completed():
     """Signals that the overall task is completed."""
     pass
@@ -55,7 +62,7 @@ def task_completed():
 
 def create_orchestrator(orchestrator_model: str, orchestrator_tools: OrchestratorTools, function_call_broadcast_callback=None) -> ComputerAgent:
     """Creates and configures the Orchestrator agent."""
-    instructions = open("agent_prompts/Orchestrator.txt", "r").read()
+    instructions = load_prompt("Orchestrator")
 
     # Gather all methods from the toolkit instance to pass to the agent
     orchestrator_tool_methods = [
@@ -65,6 +72,7 @@ def create_orchestrator(orchestrator_model: str, orchestrator_tools: Orchestrato
         orchestrator_tools.screenshot,
         delegate_to_programmer,
         delegate_to_gui_operator,
+        delegate_in_parallel,
         task_completed
     ]
 
@@ -74,5 +82,8 @@ def create_orchestrator(orchestrator_model: str, orchestrator_tools: Orchestrato
         tools=orchestrator_tool_methods,
         function_call_broadcast_callback=function_call_broadcast_callback,
         instructions=instructions,
+        # The orchestrator history is append-only between compactions, so cache its
+        # prefix (each turn's screenshot sits after the text) on providers that support it
+        use_prompt_caching=supports_prompt_caching(orchestrator_model),
         verbosity=logging.WARNING
     )